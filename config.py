@@ -25,6 +25,12 @@ TABLE_CONCEPT_MAP = f"{DB_STAGING}.STG_OLIDS_CONCEPT_MAP"
 ROLE = "APP_ADMIN"
 WAREHOUSE = "WH_NCL_ENGINEERING_XS"
 
+# Minimum seconds between liveness checks of the cached Snowflake session
+CONNECTION_CHECK_INTERVAL = 300
+
+# Prefix for Snowflake query tags (QUERY_TAG) set on app queries
+QUERY_TAG_PREFIX = "olids_explorer"
+
 # Page configuration
 PAGE_CONFIG = {
     "page_title": "OLIDS Patient Record Explorer",
@@ -36,11 +42,20 @@ PAGE_CONFIG = {
 # Query limits
 MAX_OBSERVATIONS = 10000
 
+# Table display: small tables render as static HTML, larger ones are paged
+SMALL_TABLE_MAX_ROWS = 50
+TABLE_PAGE_SIZE = 500
+
+# Cache TTLs (seconds) for st.cache_data wrapped service calls
+CACHE_TTL_FAST = 60      # Clinical activity that changes during the day (appointments)
+CACHE_TTL_SLOW = 3600    # Slowly changing reference data (demographics)
+
 # Date range filter options
 DATE_RANGE_OPTIONS = {
     "Last 12 months": 365,
     "All time": None
 }
+DATE_RANGE_OPTION_KEYS = tuple(DATE_RANGE_OPTIONS)
 
 # Date range options for past medications
 PAST_MEDICATIONS_DATE_RANGE_OPTIONS = {
@@ -48,39 +63,15 @@ PAST_MEDICATIONS_DATE_RANGE_OPTIONS = {
     "1 year": 365,
     "All": None
 }
+PAST_MEDICATIONS_DATE_RANGE_OPTION_KEYS = tuple(PAST_MEDICATIONS_DATE_RANGE_OPTIONS)
 
 # Custom CSS for styling
 CUSTOM_CSS = """
 <style>
     /* Status badges */
-    .status-active {
-        background-color: #28a745;
-        color: #ffffff;
-        padding: 6px 16px;
-        border-radius: 6px;
-        font-weight: 600;
-        display: inline-block;
-        font-size: 0.9rem;
-        text-transform: uppercase;
-        letter-spacing: 0.5px;
-        vertical-align: middle;
-    }
-
-    .status-inactive {
-        background-color: #dc3545;
-        color: #ffffff;
-        padding: 6px 16px;
-        border-radius: 6px;
-        font-weight: 600;
-        display: inline-block;
-        font-size: 0.9rem;
-        text-transform: uppercase;
-        letter-spacing: 0.5px;
-        vertical-align: middle;
-    }
-
+    .status-active,
+    .status-inactive,
     .status-deceased {
-        background-color: #6c757d;
         color: #ffffff;
         padding: 6px 16px;
         border-radius: 6px;
@@ -92,12 +83,15 @@ CUSTOM_CSS = """
         vertical-align: middle;
     }
 
+    .status-active { background-color: #28a745; }
+    .status-inactive { background-color: #dc3545; }
+    .status-deceased { background-color: #6c757d; }
+
     /* Demographics grid */
-    .demo-grid {
+    .info-grid {
         display: grid;
-        grid-template-columns: repeat(auto-fit, minmax(250px, 1fr));
-        gap: 16px;
-        margin-top: 16px;
+        gap: 1rem;
+        margin-bottom: 1.5rem;
     }
 
     .demo-item {
@@ -150,6 +144,7 @@ CUSTOM_CSS = """
         padding: 16px;
         border-radius: 8px;
     }
+
     /* Condition badges */
     .condition-badge {
         display: inline-block;
@@ -171,5 +166,14 @@ CUSTOM_CSS = """
         color: #495057;
         border: 1px solid #dee2e6;
     }
+
+    .qof-badge {
+        background-color: #084298;
+        color: #ffffff;
+        padding: 2px 6px;
+        border-radius: 3px;
+        font-size: 0.75rem;
+        margin-left: 4px;
+    }
 </style>
 """
@@ -2,14 +2,48 @@
 Database connection management for Snowflake
 """
 
+import time
 import streamlit as st
+from config import CONNECTION_CHECK_INTERVAL
 
+# Monotonic time of the last successful liveness check
+_last_checked = 0.0
 
-@st.cache_resource
+
+def is_session_alive(session):
+    """
+    Check that a cached Snowflake session can still run queries.
+
+    The check runs at most once every CONNECTION_CHECK_INTERVAL seconds so
+    that normal queries do not pay for an extra round-trip.
+
+    Args:
+        session: Snowflake session object
+
+    Returns:
+        True if the session is usable, False if it should be reacquired
+    """
+    global _last_checked
+
+    now = time.monotonic()
+    if now - _last_checked < CONNECTION_CHECK_INTERVAL:
+        return True
+
+    try:
+        session.sql("SELECT 1").collect()
+    except Exception:
+        return False
+
+    _last_checked = now
+    return True
+
+
+@st.cache_resource(validate=is_session_alive)
 def get_connection():
     """
     Get Snowflake connection using Streamlit's native connection.
-    Connection is cached for performance.
+    Connection is cached for performance and reacquired automatically
+    if it stops responding (e.g. session expiry).
 
     Returns:
         Snowflake session object
@@ -0,0 +1,133 @@
+"""
+Patient sections shared by the patient summary and patient record pages
+"""
+
+import streamlit as st
+import pandas as pd
+from utils.helpers import format_date, format_dates, format_boolean, safe_str
+
+
+def format_patient_text(patient):
+    """
+    Format every patient field for display once, so the section builders
+    share the formatted strings instead of each calling safe_str.
+
+    Args:
+        patient: Patient demographics dictionary
+
+    Returns:
+        Dictionary of column name to display string
+    """
+    return {column: safe_str(value) for column, value in patient.items()}
+
+
+def build_registration_html(patient, text):
+    """
+    Build the HTML for the registration information section.
+
+    Args:
+        patient: Patient demographics dictionary
+        text: Pre-formatted patient text fields (see format_patient_text)
+
+    Returns:
+        Rows of column HTML (see render_html_grid)
+    """
+    return [
+        [
+            f"<strong>Practice</strong><br>"
+            f"{text['PRACTICE_NAME']}<br>"
+            f"<small>Code: {text['PRACTICE_CODE']}</small><br>"
+            f"<br><strong>PCN</strong><br>"
+            f"{text['PCN_NAME']}<br>"
+            f"<small>Code: {text['PCN_CODE']}</small>",
+            f"<strong>Registration Dates</strong><br>"
+            f"Start: {format_date(patient['REGISTRATION_START_DATE'])}<br>"
+            f"End: {format_date(patient['REGISTRATION_END_DATE'])}<br>"
+            f"<br><strong>ICB</strong><br>"
+            f"{text['ICB_NAME']}<br>"
+            f"<small>{text['BOROUGH_REGISTERED']}</small>"
+        ]
+    ]
+
+
+def build_geography_html(patient, text):
+    """
+    Build the HTML for the geography information section.
+
+    Args:
+        patient: Patient demographics dictionary
+        text: Pre-formatted patient text fields (see format_patient_text)
+
+    Returns:
+        Rows of column HTML (see render_html_grid)
+    """
+    return [
+        [
+            f"<strong>Resident Location</strong><br>"
+            f"Borough: {text['BOROUGH_RESIDENT']}<br>"
+            f"ICB: {text['ICB_RESIDENT']}<br>"
+            f"Local Authority: {text['LOCAL_AUTHORITY_NAME']}<br>"
+            f"London Resident: {format_boolean(patient['IS_LONDON_RESIDENT'])}",
+            f"<strong>Area Classifications</strong><br>"
+            f"Neighbourhood: {text['NEIGHBOURHOOD_RESIDENT']}<br>"
+            f"LSOA: {text['LSOA_NAME_21']}<br>"
+            f"Ward: {text['WARD_NAME']}"
+        ],
+        [
+            f"<strong>Deprivation (IMD 2019)</strong><br>"
+            f"Quintile: {text['IMD_QUINTILE_19']}<br>"
+            f"Decile: {text['IMD_DECILE_19']}",
+            None
+        ]
+    ]
+
+
+def build_language_html(patient, text):
+    """
+    Build the HTML for the language information section.
+
+    Args:
+        patient: Patient demographics dictionary
+        text: Pre-formatted patient text fields (see format_patient_text)
+
+    Returns:
+        Rows of column HTML (see render_html_grid)
+    """
+    interpreter = f"<strong>Interpreter</strong><br>Needed: {format_boolean(patient['INTERPRETER_NEEDED'])}"
+    if patient['INTERPRETER_NEEDED']:
+        interpreter += f"<br>Type: {text['INTERPRETER_TYPE']}"
+
+    return [
+        [
+            f"<strong>Main Language</strong><br>"
+            f"{text['MAIN_LANGUAGE']}<br>"
+            f"<small>Type: {text['LANGUAGE_TYPE']}</small>",
+            interpreter
+        ]
+    ]
+
+
+def render_registration_history_table(history):
+    """
+    Render detailed registration history as a single table.
+
+    Args:
+        history: DataFrame with registration history
+    """
+    st.dataframe(
+        pd.DataFrame({
+            'Period': history['PERIOD_SEQUENCE'],
+            'Current': history['IS_CURRENT'].map({True: "Yes", False: "No"}).fillna("No"),
+            'Effective Start': format_dates(history['EFFECTIVE_START_DATE']),
+            'Effective End': format_dates(history['EFFECTIVE_END_DATE']),
+            'Registration Start': format_dates(history['REGISTRATION_START_DATE']),
+            'Registration End': format_dates(history['REGISTRATION_END_DATE']),
+            'Status': history['IS_ACTIVE'].map({True: "Active", False: "Inactive"}).fillna("Inactive"),
+            'Practice': history['PRACTICE_NAME'].apply(safe_str),
+            'Practice Code': history['PRACTICE_CODE'].apply(safe_str),
+            'PCN': history['PCN_NAME'].apply(safe_str),
+            'Borough': history['BOROUGH_REGISTERED'].apply(safe_str)
+        }),
+        use_container_width=True,
+        hide_index=True
+    )
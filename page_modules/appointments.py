@@ -2,13 +2,22 @@
 Appointments view page
 """
 
+import math
 import streamlit as st
 import pandas as pd
-import altair as alt
 from datetime import datetime
-from services.record_service import get_patient_appointments, calculate_date_range
-from utils.helpers import format_date, safe_str, format_practitioner_name
-from config import DATE_RANGE_OPTIONS
+from services.record_service import get_patient_appointments, get_appointment_monthly_counts, calculate_date_range
+from config import DATE_RANGE_OPTION_KEYS, SMALL_TABLE_MAX_ROWS, TABLE_PAGE_SIZE, MAX_OBSERVATIONS
+
+# Source columns read by render_appointment_table
+APPOINTMENT_TABLE_COLUMNS = [
+    "START_DATE",
+    "STATUS_DISPLAY",
+    "SLOT_CATEGORY",
+    "CONTACT_MODE",
+    "PLANNED_DURATION",
+    "PRACTITIONER_DISPLAY"
+]
 
 
 def render_appointments():
@@ -25,13 +34,12 @@ def render_appointments():
 
     sk_patient_id = st.session_state.selected_patient
 
-    # Get person_id from sk_patient_id for queries
-    from services.patient_service import get_patient_demographics
-    demographics = get_patient_demographics(sk_patient_id)
-    if demographics.empty:
+    # Get person_id for queries (stored at selection, no extra query)
+    from services.patient_service import get_selected_person_id
+    person_id = get_selected_person_id(sk_patient_id)
+    if not person_id:
         st.error("Failed to load patient demographics")
         return
-    person_id = demographics.iloc[0]['PERSON_ID']
 
     # Navigation buttons
     col1, col2, col3 = st.columns([1, 1, 4])
@@ -47,259 +55,281 @@ def render_appointments():
 
     st.markdown(f"## Appointments for Patient: {sk_patient_id}")
 
-    # Load all appointments (future appointments always shown, no date filter)
+    # Upcoming appointments share one query (and cache entry) with the past
+    # appointments section, so read the selected range ahead of its selectbox
+    date_range = st.session_state.get("past_appointments_date_range", DATE_RANGE_OPTION_KEYS[0])
+
     with st.spinner("Loading appointments..."):
-        appointments = get_patient_appointments(person_id, date_from=None, date_to=None, include_future=True)
+        future_df, _ = load_appointments(person_id, date_range)
 
-    if appointments.empty:
-        st.info("No appointments found")
+    # Always show future appointments section
+    st.markdown("### 📅 Upcoming Appointments")
+    if not future_df.empty:
+        st.markdown(f"**{len(future_df)} upcoming appointment(s)**")
+        render_appointment_table(future_df, show_charts=False, key="upcoming_appointments")
     else:
-        # Prepare display dataframe
-        display_df = appointments.copy()
-        
-        # Convert start_date to datetime
-        display_df["START_DATE"] = pd.to_datetime(display_df["START_DATE"])
+        st.markdown("No future appointments booked")
+    
+    st.markdown("<br>", unsafe_allow_html=True)
+    st.markdown("---")
+    st.markdown("<br>", unsafe_allow_html=True)
+    
+    # Past appointments section
+    render_past_appointments(person_id)
+
+
+def load_appointments(person_id, date_range, now=None):
+    """
+    Load upcoming appointments plus past appointments within a date range.
+
+    Args:
+        person_id: Patient identifier
+        date_range: Selected DATE_RANGE_OPTIONS key for past appointments
+        now: Timestamp splitting past from upcoming appointments (default current time)
+
+    Returns:
+        Tuple of (future_df, past_df)
+    """
+    date_from, date_to = calculate_date_range(date_range)
+    appointments = get_patient_appointments(person_id, date_from=date_from, date_to=date_to, include_future=True)
+
+    if appointments.empty:
+        return pd.DataFrame(), pd.DataFrame()
+
+    # Separate future and past appointments (START_DATE is already datetime).
+    # The query returns all of today's appointments as upcoming; those that
+    # have already started are moved to the past here.
+    if now is None:
+        now = pd.Timestamp.now()
+    is_future = appointments["START_DATE"] >= now
+    return (
+        appointments.loc[is_future, APPOINTMENT_TABLE_COLUMNS],
+        appointments.loc[~is_future, APPOINTMENT_TABLE_COLUMNS]
+    )
+
+
+@st.fragment
+def render_past_appointments(person_id):
+    """
+    Render past appointments with date range filter, charts and table.
+    Runs as a fragment so changing the date range only reruns this section.
+
+    Args:
+        person_id: Patient identifier
+    """
+    st.markdown("### 📊 Past Appointments")
+    
+    # Date range filter for past appointments (applied in the query)
+    date_range = st.selectbox(
+        "Date Range",
+        options=DATE_RANGE_OPTION_KEYS,
+        index=0,
+        key="past_appointments_date_range"
+    )
+    date_from, date_to = calculate_date_range(date_range)
+    
+    # One timestamp for the table split and today's chart counts
+    now = pd.Timestamp.now()
+    with st.spinner("Loading past appointments..."):
+        _, past_df = load_appointments(person_id, date_range, now)
+    
+    if past_df.empty:
+        st.info("No past appointments found for the selected time period")
+        return
+    
+    st.markdown(f"**Showing {len(past_df):,} past appointment(s)** (limited to {MAX_OBSERVATIONS:,} most recent)")
+    
+    # Chart counts are aggregated in Snowflake (one row per month, status
+    # and slot category) rather than grouped from the detail rows
+    with st.spinner("Loading appointment trends..."):
+        counts_df = get_appointment_monthly_counts(person_id, date_from=date_from, date_to=date_to)
+    
+    # The aggregated counts stop before today; add today's appointments that
+    # have already started from the detail rows
+    today = now.normalize()
+    today_df = past_df[past_df["START_DATE"] >= today]
+    if not today_df.empty:
+        today_counts = today_df.groupby(["STATUS_DISPLAY", "SLOT_CATEGORY"]).size().reset_index(name="COUNT")
+        today_counts.insert(0, "YEAR_MONTH", today.replace(day=1))
+        counts_df = pd.concat([counts_df, today_counts], ignore_index=True)
+    
+    if not counts_df.empty:
+        # Visualization Section
+        st.markdown("#### Trends")
         
-        # Separate future and past appointments
-        future_df = display_df[display_df["IS_FUTURE"] == True].copy()
-        past_df = display_df[display_df["IS_FUTURE"] == False].copy()
+        monthly_counts = counts_df.set_index([
+            counts_df["YEAR_MONTH"].dt.to_period("M"),
+            "STATUS_DISPLAY",
+            "SLOT_CATEGORY"
+        ])["COUNT"]
         
-        # Always show future appointments section
-        st.markdown("### 📅 Upcoming Appointments")
-        if not future_df.empty:
-            st.markdown(f"**{len(future_df)} upcoming appointment(s)**")
-            render_appointment_table(future_df, show_charts=False)
+        # Determine date range for placeholder months
+        if date_from:
+            # Use selected date range (to today if open-ended)
+            chart_start = pd.Timestamp(date_from).to_period("M")
+            chart_end = pd.Timestamp(date_to or datetime.now()).to_period("M")
         else:
-            st.markdown("No future appointments booked")
+            # Use data range
+            months = monthly_counts.index.get_level_values("YEAR_MONTH")
+            chart_start = months.min()
+            chart_end = months.max()
         
-        st.markdown("<br>", unsafe_allow_html=True)
-        st.markdown("---")
-        st.markdown("<br>", unsafe_allow_html=True)
+        # Generate all months in range
+        all_months = pd.period_range(chart_start, chart_end, freq="M")
         
-        # Past appointments section
-        if not past_df.empty:
-            st.markdown("### 📊 Past Appointments")
-            
-            # Date range filter for past appointments
-            date_range = st.selectbox(
-                "Date Range",
-                options=list(DATE_RANGE_OPTIONS.keys()),
-                index=0,
-                key="past_appointments_date_range"
-            )
-            
-            # Calculate date range
-            date_from, date_to = calculate_date_range(date_range)
-            
-            # Filter past appointments by date range
-            if date_from:
-                past_df = past_df[past_df["START_DATE"] >= pd.to_datetime(date_from)]
-            if date_to:
-                past_df = past_df[past_df["START_DATE"] <= pd.to_datetime(date_to)]
-            
-            if past_df.empty:
-                st.info("No past appointments found for the selected time period")
-                return
-            
-            st.markdown(f"**Showing {len(past_df):,} past appointment(s)** (limited to 10,000 most recent)")
-            
-            # Create year-month for grouping (format: yyyy-mmm)
-            past_df["YEAR_MONTH"] = past_df["START_DATE"].dt.strftime("%Y-%b")
-            
-            # Clean up status names
-            past_df["STATUS_DISPLAY"] = past_df["APPOINTMENT_STATUS"].apply(
-                lambda x: safe_str(x).title() if pd.notna(x) else "Unknown"
-            )
-            
-            # Clean up slot category names
-            past_df["SLOT_CATEGORY"] = past_df["NATIONAL_SLOT_CATEGORY_NAME"].apply(
-                lambda x: safe_str(x) if x and x != "N/A" else "Not Specified"
-            )
-            
-            # Visualization Section
-            st.markdown("#### Trends")
-            
-            # Determine date range for placeholder months
-            if date_from and date_to:
-                # Use selected date range
-                chart_start = pd.to_datetime(date_from).to_period("M").to_timestamp()
-                chart_end = pd.to_datetime(date_to).to_period("M").to_timestamp()
-            elif date_from:
-                # Use date_from to today
-                chart_start = pd.to_datetime(date_from).to_period("M").to_timestamp()
-                chart_end = pd.to_datetime(datetime.now()).to_period("M").to_timestamp()
-            else:
-                # Use data range
-                chart_start = past_df["START_DATE"].min().to_period("M").to_timestamp()
-                chart_end = past_df["START_DATE"].max().to_period("M").to_timestamp()
-            
-            # Generate all months in range
-            all_months = []
-            current = chart_start
-            while current <= chart_end:
-                year_month = current.strftime("%Y-%b")
-                all_months.append({
-                    'YEAR_MONTH': year_month,
-                    'SORT_DATE': current
-                })
-                # Move to next month
-                current = (current.to_period("M") + 1).to_timestamp()
-            
-            all_months_df = pd.DataFrame(all_months)
-            
-            # Create sortable date column
-            past_df["SORT_DATE"] = past_df["START_DATE"].dt.to_period("M").dt.to_timestamp()
-            
-            # Get all unique statuses and slot categories
-            all_statuses = past_df["STATUS_DISPLAY"].unique()
-            all_slot_categories = past_df["SLOT_CATEGORY"].unique()
-            
-            # Group by month and status
-            status_counts = past_df.groupby(["YEAR_MONTH", "STATUS_DISPLAY", "SORT_DATE"]).size().reset_index(name="COUNT")
-            
-            # Create complete status counts with placeholder months
-            status_complete = []
-            for _, month_row in all_months_df.iterrows():
-                for status in all_statuses:
-                    matching = status_counts[
-                        (status_counts["YEAR_MONTH"] == month_row["YEAR_MONTH"]) &
-                        (status_counts["STATUS_DISPLAY"] == status)
-                    ]
-                    count = matching["COUNT"].iloc[0] if not matching.empty else 0
-                    status_complete.append({
-                        'YEAR_MONTH': month_row["YEAR_MONTH"],
-                        'STATUS_DISPLAY': status,
-                        'SORT_DATE': month_row["SORT_DATE"],
-                        'COUNT': count
-                    })
-            
-            status_counts_complete = pd.DataFrame(status_complete)
-            status_counts_complete = status_counts_complete.sort_values("SORT_DATE")
-            
-            # Create timeline chart colored by status using Altair
-            status_chart = alt.Chart(status_counts_complete).mark_bar().encode(
-                x=alt.X("YEAR_MONTH:N", title="Month", axis=alt.Axis(labelAngle=-45), sort=alt.SortField(field="SORT_DATE", order="ascending")),
-                y=alt.Y("COUNT:Q", title="Number of Appointments"),
-                color=alt.Color("STATUS_DISPLAY:N", title="Status", legend=alt.Legend(columns=1, symbolLimit=0, labelLimit=250)),
-                tooltip=["YEAR_MONTH:N", "STATUS_DISPLAY:N", "COUNT:Q"]
-            ).properties(
-                title="Appointments Over Time by Status",
-                width="container",
-                height=400
-            ).configure_legend(
-                padding=15,
-                labelLimit=250
-            )
-            st.altair_chart(status_chart, use_container_width=True)
-            
-            # Second chart: by slot category
-            slot_counts = past_df.groupby(["YEAR_MONTH", "SLOT_CATEGORY", "SORT_DATE"]).size().reset_index(name="COUNT")
-            
-            # Create complete slot counts with placeholder months
-            slot_complete = []
-            for _, month_row in all_months_df.iterrows():
-                for category in all_slot_categories:
-                    matching = slot_counts[
-                        (slot_counts["YEAR_MONTH"] == month_row["YEAR_MONTH"]) &
-                        (slot_counts["SLOT_CATEGORY"] == category)
-                    ]
-                    count = matching["COUNT"].iloc[0] if not matching.empty else 0
-                    slot_complete.append({
-                        'YEAR_MONTH': month_row["YEAR_MONTH"],
-                        'SLOT_CATEGORY': category,
-                        'SORT_DATE': month_row["SORT_DATE"],
-                        'COUNT': count
-                    })
-            
-            slot_counts_complete = pd.DataFrame(slot_complete)
-            slot_counts_complete = slot_counts_complete.sort_values("SORT_DATE")
-            
-            slot_chart = alt.Chart(slot_counts_complete).mark_bar().encode(
-                x=alt.X("YEAR_MONTH:N", title="Month", axis=alt.Axis(labelAngle=-45), sort=alt.SortField(field="SORT_DATE", order="ascending")),
-                y=alt.Y("COUNT:Q", title="Number of Appointments"),
-                color=alt.Color("SLOT_CATEGORY:N", title="Slot Category", legend=alt.Legend(columns=1, symbolLimit=0, labelLimit=250)),
-                tooltip=["YEAR_MONTH:N", "SLOT_CATEGORY:N", "COUNT:Q"]
-            ).properties(
-                title="Appointments Over Time by Slot Category",
-                width="container",
-                height=400
-            ).configure_legend(
-                padding=15,
-                labelLimit=250
-            )
-            st.altair_chart(slot_chart, use_container_width=True)
-            
-            st.markdown("#### Details")
-            render_appointment_table(past_df, show_charts=False)
-        else:
-            st.info("No past appointments found")
+        # Monthly counts by status, including placeholder months
+        status_counts_complete = build_monthly_counts(monthly_counts, all_months, "STATUS_DISPLAY")
+        
+        # Create timeline chart colored by status
+        status_spec = get_timeline_spec("STATUS_DISPLAY", "Status", "Appointments Over Time by Status")
+        st.vega_lite_chart(status_counts_complete, status_spec, use_container_width=True)
+        
+        # Second chart: monthly counts by slot category
+        slot_counts_complete = build_monthly_counts(monthly_counts, all_months, "SLOT_CATEGORY")
+        
+        slot_spec = get_timeline_spec("SLOT_CATEGORY", "Slot Category", "Appointments Over Time by Slot Category")
+        st.vega_lite_chart(slot_counts_complete, slot_spec, use_container_width=True)
+    
+    st.markdown("#### Details")
+    render_appointment_table(past_df, show_charts=False, key="past_appointments")
 
 
-def render_appointment_table(df, show_charts=True):
+def get_timeline_spec(color_field, color_title, title):
+    """
+    Build a Vega-Lite spec for a monthly appointments bar chart.
+    Passed straight to st.vega_lite_chart, skipping Altair's chart
+    construction and schema validation.
+
+    Args:
+        color_field: Column to colour the bars by
+        color_title: Legend title
+        title: Chart title
+
+    Returns:
+        Vega-Lite spec dict (without data)
+    """
+    return {
+        "mark": "bar",
+        "title": title,
+        "height": 400,
+        "encoding": {
+            "x": {
+                "field": "YEAR_MONTH",
+                "type": "ordinal",
+                "timeUnit": "utcyearmonth",
+                "title": "Month",
+                "axis": {"labelAngle": -45, "format": "%Y-%b"}
+            },
+            "y": {"field": "COUNT", "type": "quantitative", "title": "Number of Appointments"},
+            "color": {
+                "field": color_field,
+                "type": "nominal",
+                "title": color_title,
+                "legend": {"columns": 1, "symbolLimit": 0, "labelLimit": 250}
+            },
+            "tooltip": [
+                {"field": "YEAR_MONTH", "type": "ordinal", "timeUnit": "utcyearmonth", "format": "%Y-%b"},
+                {"field": color_field, "type": "nominal"},
+                {"field": "COUNT", "type": "quantitative"}
+            ]
+        },
+        "config": {"legend": {"padding": 15, "labelLimit": 250}}
+    }
+
+
+def build_monthly_counts(monthly_counts, all_months, category_col):
+    """
+    Sum appointment counts per month and category, filling months with no
+    activity with zero counts.
+
+    Args:
+        monthly_counts: Series of counts indexed by YEAR_MONTH (monthly Period)
+            and one or more category levels
+        all_months: PeriodIndex of every month in the chart range
+        category_col: Category level to split counts by
+
+    Returns:
+        DataFrame with YEAR_MONTH (month start timestamp), category and COUNT, in month order
+    """
+    counts = monthly_counts.groupby(level=["YEAR_MONTH", category_col], observed=True).sum()
+    full_index = pd.MultiIndex.from_product(
+        [all_months, counts.index.get_level_values(category_col).unique()],
+        names=["YEAR_MONTH", category_col]
+    )
+    complete = counts.reindex(full_index, fill_value=0).reset_index(name="COUNT")
+
+    # Months are sent as timestamps only; the chart orders and labels them
+    # client-side, so no label or sort column is shipped per row
+    complete["YEAR_MONTH"] = complete["YEAR_MONTH"].dt.to_timestamp()
+    return complete
+
+
+def render_appointment_table(df, show_charts=True, key="appointments"):
     """
     Render appointment details table.
+    Small tables are formatted and rendered with st.table; larger ones are
+    paged and keep their raw typed columns, which st.dataframe formats
+    client-side via column_config.
     
     Args:
         df: DataFrame with appointment data
         show_charts: Whether to show charts (not used currently)
+        key: Unique key prefix for the table's widgets
     """
-    # Format for table display
-    df["DATE_DISPLAY"] = df["START_DATE"].apply(
-        lambda x: x.strftime("%d %b %Y %H:%M") if pd.notna(x) else "N/A"
-    )
-    
-    # Format status
-    df["STATUS_DISPLAY"] = df["APPOINTMENT_STATUS"].apply(
-        lambda x: safe_str(x).title() if pd.notna(x) else "Unknown"
-    )
-    
-    # Format contact mode
-    df["CONTACT_DISPLAY"] = df["CONTACT_MODE"].apply(
-        lambda x: safe_str(x).replace("-", " ").title() if pd.notna(x) else "Not Specified"
-    )
-    
-    # Format slot category
-    df["SLOT_DISPLAY"] = df["NATIONAL_SLOT_CATEGORY_NAME"].apply(
-        lambda x: safe_str(x) if x and x != "N/A" else "Not Specified"
-    )
-    
-    # Format practitioner name
-    df["PRACTITIONER"] = df.apply(
-        lambda row: format_practitioner_name(
-            row["PRACTITIONER_LAST_NAME"],
-            row["PRACTITIONER_FIRST_NAME"],
-            row["PRACTITIONER_TITLE"]
-        ),
-        axis=1
-    )
-    
-    # Format duration
-    df["DURATION"] = df["PLANNED_DURATION"].apply(
-        lambda x: f"{int(x)} min" if pd.notna(x) else "N/A"
+    # Page large tables before formatting
+    total_rows = len(df)
+    if total_rows > TABLE_PAGE_SIZE:
+        total_pages = math.ceil(total_rows / TABLE_PAGE_SIZE)
+        page = st.number_input(
+            f"Page (of {total_pages})",
+            min_value=1,
+            max_value=total_pages,
+            value=1,
+            step=1,
+            key=f"{key}_page_{total_pages}"
+        )
+        df = df.iloc[(page - 1) * TABLE_PAGE_SIZE:page * TABLE_PAGE_SIZE]
+
+    # Text columns are built into a new frame (df is left unmodified)
+    contact = (
+        df["CONTACT_MODE"].astype("string")
+        .str.replace("-", " ", regex=False)
+        .str.title()
+        .fillna("Not Specified")
     )
-    
-    # Select and rename columns for display
-    table_df = df[[
-        "DATE_DISPLAY",
-        "STATUS_DISPLAY",
-        "SLOT_DISPLAY",
-        "CONTACT_DISPLAY",
-        "DURATION",
-        "PRACTITIONER"
-    ]]
-    table_df.columns = ["Date & Time", "Status", "Slot Category", "Contact Mode", "Duration", "Practitioner"]
-    
-    # Display table
-    if len(df) > 10:
+
+    if total_rows <= SMALL_TABLE_MAX_ROWS:
+        duration = pd.to_numeric(df["PLANNED_DURATION"], errors="coerce").round().astype("Int64")
+        table_df = pd.DataFrame({
+            "Date & Time": df["START_DATE"].dt.strftime("%d %b %Y %H:%M").fillna("N/A"),
+            "Status": df["STATUS_DISPLAY"],
+            "Slot Category": df["SLOT_CATEGORY"],
+            "Contact Mode": contact,
+            "Duration": (duration.astype("string") + " min").fillna("N/A"),
+            "Practitioner": df["PRACTITIONER_DISPLAY"]
+        })
+        st.table(table_df.set_index("Date & Time"))
+    else:
+        # Dates and durations stay typed and are formatted in the browser
+        table_df = pd.DataFrame({
+            "START_DATE": df["START_DATE"],
+            "STATUS_DISPLAY": df["STATUS_DISPLAY"],
+            "SLOT_CATEGORY": df["SLOT_CATEGORY"],
+            "CONTACT_MODE": contact,
+            "PLANNED_DURATION": pd.to_numeric(df["PLANNED_DURATION"], errors="coerce"),
+            "PRACTITIONER_DISPLAY": df["PRACTITIONER_DISPLAY"]
+        })
         st.dataframe(
             table_df,
+            column_config={
+                "START_DATE": st.column_config.DatetimeColumn("Date & Time", format="DD MMM YYYY HH:mm"),
+                "STATUS_DISPLAY": st.column_config.TextColumn("Status"),
+                "SLOT_CATEGORY": st.column_config.TextColumn("Slot Category"),
+                "CONTACT_MODE": st.column_config.TextColumn("Contact Mode"),
+                "PLANNED_DURATION": st.column_config.NumberColumn("Duration", format="%d min"),
+                "PRACTITIONER_DISPLAY": st.column_config.TextColumn("Practitioner")
+            },
             use_container_width=True,
             hide_index=True,
             height=600
         )
-    else:
-        st.dataframe(
-            table_df,
-            use_container_width=True,
-            hide_index=True
-        )
@@ -4,76 +4,9 @@ Medications view page
 
 import streamlit as st
 import pandas as pd
-from datetime import datetime, timedelta
 from services.record_service import get_patient_medications, calculate_date_range
-from utils.helpers import format_date, safe_str, format_practitioner_name
-from config import PAST_MEDICATIONS_DATE_RANGE_OPTIONS
-
-
-def calculate_past_medications_date_range(range_option):
-    """
-    Calculate date range for past medications based on selection.
-
-    Args:
-        range_option: Selected date range option
-
-    Returns:
-        Tuple of (date_from, date_to) or (None, None) for all time
-    """
-    days = PAST_MEDICATIONS_DATE_RANGE_OPTIONS.get(range_option)
-
-    if days is None:
-        return None, None
-
-    date_to = datetime.now().date()
-    date_from = date_to - timedelta(days=days)
-
-    return date_from, date_to
-
-
-def calculate_medication_status(row):
-    """
-    Calculate medication status based on cancellation, expiry, and duration.
-
-    Args:
-        row: DataFrame row with medication data
-
-    Returns:
-        Status string: "Current", "Cancelled", "Expired", "Past", or "Unknown"
-    """
-    try:
-        today = datetime.now()
-
-        # Check if cancelled
-        if not pd.isna(row['CANCELLATION_DATE']):
-            cancellation_date = pd.to_datetime(row['CANCELLATION_DATE'])
-            if cancellation_date <= today:
-                return "Cancelled"
-
-        # Check statement expiry date
-        if not pd.isna(row['EXPIRY_DATE']):
-            expiry_date = pd.to_datetime(row['EXPIRY_DATE'])
-            if expiry_date < today:
-                return "Expired"
-
-        # Check statement is_active flag
-        if not pd.isna(row['STATEMENT_IS_ACTIVE']) and row['STATEMENT_IS_ACTIVE'] == False:
-            return "Past"
-
-        # Check duration-based expiry
-        if not pd.isna(row['CLINICAL_EFFECTIVE_DATE']) and not pd.isna(row['DURATION_DAYS']):
-            start_date = pd.to_datetime(row['CLINICAL_EFFECTIVE_DATE'])
-            duration_days = int(row['DURATION_DAYS'])
-            end_date = start_date + timedelta(days=duration_days)
-
-            if today <= end_date:
-                return "Current"
-            else:
-                return "Expired"
-
-        return "Current"
-    except:
-        return "Unknown"
+from utils.helpers import format_dates, safe_str
+from config import PAST_MEDICATIONS_DATE_RANGE_OPTIONS, PAST_MEDICATIONS_DATE_RANGE_OPTION_KEYS, MAX_OBSERVATIONS
 
 
 def prepare_medications_display(medications):
@@ -81,7 +14,7 @@ def prepare_medications_display(medications):
     Prepare medications dataframe for display.
 
     Args:
-        medications: DataFrame with medication data
+        medications: DataFrame with medication data (including STATUS)
 
     Returns:
         Formatted DataFrame ready for display
@@ -89,63 +22,33 @@ def prepare_medications_display(medications):
     if medications.empty:
         return pd.DataFrame()
 
-    display_df = medications.copy()
-
-    # Calculate medication status
-    display_df['STATUS'] = display_df.apply(calculate_medication_status, axis=1)
-
-    # Format date for display
-    display_df['DATE_DISPLAY'] = display_df['CLINICAL_EFFECTIVE_DATE'].apply(format_date)
-
-    # Format issue method (from medication_orders.issue_method_description)
-    display_df['ISSUE_METHOD'] = display_df['ISSUE_METHOD_DESCRIPTION'].apply(safe_str)
-
-    # Format authorisation type (from medication_statement.authorisation_type_display)
-    display_df['AUTHORISATION_TYPE'] = display_df['AUTHORISATION_TYPE_DISPLAY'].apply(safe_str)
-
-    # Format dose and quantity
-    display_df['DOSE_INFO'] = display_df['DOSE'].apply(safe_str)
-    display_df['QUANTITY_INFO'] = display_df.apply(
-        lambda row: f"{safe_str(row['QUANTITY_VALUE'])} {safe_str(row['QUANTITY_UNIT'])}"
-        if row['QUANTITY_VALUE'] and row['QUANTITY_UNIT'] else safe_str(row['QUANTITY_VALUE']),
-        axis=1
-    )
-
-    # Format duration if available
-    display_df['DURATION_INFO'] = display_df.apply(
-        lambda row: f"{int(row['DURATION_DAYS'])} days"
-        if row['DURATION_DAYS'] and str(row['DURATION_DAYS']) != 'nan' else "",
-        axis=1
-    )
-
-    # Format practitioner name
-    display_df['PRACTITIONER'] = display_df.apply(
-        lambda row: format_practitioner_name(
-            row['PRACTITIONER_LAST_NAME'],
-            row['PRACTITIONER_FIRST_NAME'],
-            row['PRACTITIONER_TITLE']
-        ),
-        axis=1
-    )
-
-    # Select and rename columns for display
-    display_df = display_df[[
-        'DATE_DISPLAY',
-        'STATUS',
-        'ISSUE_METHOD',
-        'AUTHORISATION_TYPE',
-        'MAPPED_CONCEPT_DISPLAY',
-        'DOSE_INFO',
-        'QUANTITY_INFO',
-        'DURATION_INFO',
-        'PRACTITIONER'
-    ]]
-    display_df.columns = [
-        'Date', 'Status', 'Issue Method', 'Authorisation Type', 
-        'Medication', 'Dose', 'Quantity', 'Duration', 'Prescriber'
-    ]
-
-    return display_df
+    # Build the display frame in one expression from the formatted columns
+    # (no copy of the source frame). Quantity, duration and prescriber are
+    # formatted in the query. Issue method is from medication_orders and
+    # authorisation type from medication_statement. Low-cardinality text
+    # columns are stored (and sent to the browser) as categoricals; the rest
+    # use Arrow-backed strings rather than object.
+    return pd.DataFrame({
+        'Date': format_dates(medications['CLINICAL_EFFECTIVE_DATE']),
+        'Status': medications['STATUS'],
+        'Issue Method': medications['ISSUE_METHOD_DESCRIPTION'].apply(safe_str),
+        'Authorisation Type': medications['AUTHORISATION_TYPE_DISPLAY'].apply(safe_str),
+        'Medication': medications['MAPPED_CONCEPT_DISPLAY'],
+        'Dose': medications['DOSE'].apply(safe_str),
+        'Quantity': medications['QUANTITY_INFO'],
+        'Duration': medications['DURATION_INFO'],
+        'Prescriber': medications['PRACTITIONER_DISPLAY']
+    }).astype({
+        'Date': 'string[pyarrow]',
+        'Medication': 'string[pyarrow]',
+        'Status': 'category',
+        'Issue Method': 'category',
+        'Authorisation Type': 'category',
+        'Dose': 'category',
+        'Quantity': 'category',
+        'Duration': 'category',
+        'Prescriber': 'category'
+    })
 
 
 def render_medications():
@@ -162,13 +65,12 @@ def render_medications():
 
     sk_patient_id = st.session_state.selected_patient
 
-    # Get person_id from sk_patient_id for queries
-    from services.patient_service import get_patient_demographics
-    demographics = get_patient_demographics(sk_patient_id)
-    if demographics.empty:
+    # Get person_id for queries (stored at selection, no extra query)
+    from services.patient_service import get_selected_person_id
+    person_id = get_selected_person_id(sk_patient_id)
+    if not person_id:
         st.error("Failed to load patient demographics")
         return
-    person_id = demographics.iloc[0]['PERSON_ID']
 
     # Navigation buttons
     col1, col2, col3 = st.columns([1, 1, 4])
@@ -191,17 +93,59 @@ def render_medications():
         key="med_search"
     )
 
+    # Current and past medications share one query (and cache entry), so
+    # read the selected past range ahead of its selectbox
+    date_range = st.session_state.get(
+        "past_med_date_range", PAST_MEDICATIONS_DATE_RANGE_OPTION_KEYS[0]
+    )
+
+    with st.spinner("Loading current medications..."):
+        current_medications, _ = load_medications(person_id, search_term, date_range)
+
     # Current Medications Section
+    render_current_medications(current_medications)
+
+    # Past Medications Section
+    render_past_medications(person_id, search_term)
+
+
+def load_medications(person_id, search_term, date_range):
+    """
+    Load all current medications plus past medications within a date range.
+
+    Args:
+        person_id: Patient identifier
+        search_term: Search term for code or description
+        date_range: Selected PAST_MEDICATIONS_DATE_RANGE_OPTIONS key
+
+    Returns:
+        Tuple of (current_df, past_df)
+    """
+    date_from, date_to = calculate_date_range(date_range, PAST_MEDICATIONS_DATE_RANGE_OPTIONS)
+    medications = get_patient_medications(
+        person_id,
+        date_from=date_from,
+        date_to=date_to,
+        search_term=search_term,
+        include_current=True
+    )
+
+    if medications.empty:
+        return pd.DataFrame(), pd.DataFrame()
+
+    # Split on the status computed in the query
+    is_current = medications['STATUS'].eq('Current')
+    return medications.loc[is_current], medications.loc[~is_current]
+
+
+def render_current_medications(current_medications):
+    """
+    Render the current medications table.
+
+    Args:
+        current_medications: DataFrame with current medications
+    """
     st.markdown("### Current Medications")
-    
-    with st.spinner("Loading current medications..."):
-        current_medications = get_patient_medications(
-            person_id, 
-            date_from=None, 
-            date_to=None, 
-            search_term=search_term,
-            current_only=True
-        )
 
     if current_medications.empty:
         st.info("No current medications found")
@@ -215,44 +159,35 @@ def render_medications():
             height=300
         )
 
-    # Past Medications Section
+
+@st.fragment
+def render_past_medications(person_id, search_term):
+    """
+    Render past medications with date range filter.
+    Runs as a fragment so changing the date range only reruns this section.
+
+    Args:
+        person_id: Patient identifier
+        search_term: Search term for code or description
+    """
     st.markdown("### Past Medications")
     
     col1, col2 = st.columns([2, 3])
     with col1:
         date_range = st.selectbox(
             "Date Range",
-            options=list(PAST_MEDICATIONS_DATE_RANGE_OPTIONS.keys()),
+            options=PAST_MEDICATIONS_DATE_RANGE_OPTION_KEYS,
             index=0,  # Default to "90 days"
             key="past_med_date_range"
         )
 
-    # Calculate date range for past medications
-    date_from, date_to = calculate_past_medications_date_range(date_range)
-
     with st.spinner("Loading past medications..."):
-        past_medications = get_patient_medications(
-            person_id, 
-            date_from=date_from, 
-            date_to=date_to, 
-            search_term=search_term,
-            current_only=False
-        )
-
-        # Filter out current medications from past medications
-        if not past_medications.empty:
-            # Recalculate status to identify current vs past
-            past_medications_copy = past_medications.copy()
-            past_medications_copy['STATUS'] = past_medications_copy.apply(calculate_medication_status, axis=1)
-            # Only show medications that are not current
-            past_medications = past_medications[
-                past_medications_copy['STATUS'].isin(['Cancelled', 'Expired', 'Past', 'Unknown'])
-            ]
+        _, past_medications = load_medications(person_id, search_term, date_range)
 
     if past_medications.empty:
         st.info("No past medications found for the selected filters")
     else:
-        st.markdown(f"**Showing {len(past_medications):,} past medications** (limited to 10,000 most recent)")
+        st.markdown(f"**Showing {len(past_medications):,} past medications** (limited to {MAX_OBSERVATIONS:,} most recent)")
         past_display = prepare_medications_display(past_medications)
         st.dataframe(
             past_display,
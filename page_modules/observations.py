@@ -5,8 +5,43 @@ Observations view page
 import streamlit as st
 import pandas as pd
 from services.record_service import get_patient_observations, calculate_date_range
-from utils.helpers import format_date, format_value_with_unit, format_practitioner_name, safe_str
-from config import DATE_RANGE_OPTIONS
+from utils.helpers import format_dates, format_values_with_units, safe_str
+from config import DATE_RANGE_OPTION_KEYS, TABLE_PAGE_SIZE, CACHE_TTL_FAST
+
+
+@st.cache_data(ttl=CACHE_TTL_FAST, show_spinner=False)
+def prepare_observations_display(observations):
+    """
+    Prepare observations dataframe for display.
+    Cached on the page of observations, so reruns that leave it unchanged
+    reuse the formatted frame.
+
+    Args:
+        observations: DataFrame with one page of observation data
+
+    Returns:
+        Formatted DataFrame ready for display
+    """
+    # Build the display frame directly from the formatted columns (no
+    # copy of the source frame), preferring numeric value if present
+    return pd.DataFrame({
+        'Date': format_dates(observations['CLINICAL_EFFECTIVE_DATE']),
+        'Code': observations['MAPPED_CONCEPT_CODE'],
+        'Observation': observations['MAPPED_CONCEPT_DISPLAY'],
+        'Value': format_values_with_units(
+            observations['RESULT_VALUE'].astype(object).where(
+                observations['RESULT_VALUE'].notna(), observations['RESULT_TEXT']
+            ),
+            observations['RESULT_UNIT_DISPLAY']
+        ),
+        'Is Problem': observations['IS_PROBLEM'].apply(
+            lambda x: "Yes" if x == True else "No"
+        ),
+        'Episodicity': observations['EPISODICITY_DISPLAY'].apply(
+            lambda x: safe_str(x) if pd.notna(x) and x != "N/A" else ""
+        ),
+        'Practitioner': observations['PRACTITIONER_DISPLAY']
+    })
 
 
 def render_observations():
@@ -23,13 +58,12 @@ def render_observations():
 
     sk_patient_id = st.session_state.selected_patient
 
-    # Get person_id from sk_patient_id for queries
-    from services.patient_service import get_patient_demographics
-    demographics = get_patient_demographics(sk_patient_id)
-    if demographics.empty:
+    # Get person_id for queries (stored at selection, no extra query)
+    from services.patient_service import get_selected_person_id
+    person_id = get_selected_person_id(sk_patient_id)
+    if not person_id:
         st.error("Failed to load patient demographics")
         return
-    person_id = demographics.iloc[0]['PERSON_ID']
 
     # Navigation buttons
     col1, col2, col3 = st.columns([1, 1, 4])
@@ -52,7 +86,7 @@ def render_observations():
     with col1:
         date_range = st.selectbox(
             "Date Range",
-            options=list(DATE_RANGE_OPTIONS.keys()),
+            options=DATE_RANGE_OPTION_KEYS,
             index=0
         )
 
@@ -66,59 +100,32 @@ def render_observations():
     # Calculate date range
     date_from, date_to = calculate_date_range(date_range)
 
+    # Observations are fetched one page at a time; go back to the first
+    # page whenever the patient or filters change
+    filters = (person_id, date_range, search_term)
+    if st.session_state.get("obs_filters") != filters:
+        st.session_state.obs_filters = filters
+        st.session_state.obs_page = 0
+    page = st.session_state.obs_page
+    offset = page * TABLE_PAGE_SIZE
+
     # Load observations
     with st.spinner("Loading observations..."):
-        observations = get_patient_observations(person_id, date_from, date_to, search_term)
+        observations = get_patient_observations(
+            person_id, date_from, date_to, search_term,
+            limit=TABLE_PAGE_SIZE,
+            offset=offset
+        )
 
     if observations.empty:
         st.info("No observations found for the selected filters")
     else:
-        st.markdown(f"**Showing {len(observations):,} observations** (limited to 10,000 most recent)")
-
-        # Prepare display dataframe
-        display_df = observations.copy()
-        display_df['CLINICAL_EFFECTIVE_DATE'] = display_df['CLINICAL_EFFECTIVE_DATE'].apply(format_date)
-
-        # Combine result_value and result_text, preferring numeric value if present
-        display_df['VALUE'] = display_df.apply(
-            lambda row: format_value_with_unit(
-                row['RESULT_VALUE'] if pd.notna(row['RESULT_VALUE']) else row['RESULT_TEXT'],
-                row['RESULT_UNIT_DISPLAY']
-            ),
-            axis=1
+        total_rows = int(observations['TOTAL_ROWS'].iloc[0])
+        st.markdown(
+            f"**Showing {offset + 1:,}–{offset + len(observations):,} of {total_rows:,} observations**"
         )
 
-        # Format practitioner name
-        display_df['PRACTITIONER'] = display_df.apply(
-            lambda row: format_practitioner_name(
-                row['PRACTITIONER_LAST_NAME'],
-                row['PRACTITIONER_FIRST_NAME'],
-                row['PRACTITIONER_TITLE']
-            ),
-            axis=1
-        )
-
-        # Format is_problem as Yes/No
-        display_df['IS_PROBLEM_DISPLAY'] = display_df['IS_PROBLEM'].apply(
-            lambda x: "Yes" if x == True else "No"
-        )
-        
-        # Format episodicity display
-        display_df['EPISODICITY_DISPLAY'] = display_df['EPISODICITY_DISPLAY'].apply(
-            lambda x: safe_str(x) if pd.notna(x) and x != "N/A" else ""
-        )
-        
-        # Select and rename columns for display
-        display_df = display_df[[
-            'CLINICAL_EFFECTIVE_DATE',
-            'MAPPED_CONCEPT_CODE',
-            'MAPPED_CONCEPT_DISPLAY',
-            'VALUE',
-            'IS_PROBLEM_DISPLAY',
-            'EPISODICITY_DISPLAY',
-            'PRACTITIONER'
-        ]]
-        display_df.columns = ['Date', 'Code', 'Observation', 'Value', 'Is Problem', 'Episodicity', 'Practitioner']
+        display_df = prepare_observations_display(observations)
 
         # Display table
         st.dataframe(
@@ -127,3 +134,14 @@ def render_observations():
             hide_index=True,
             height=600
         )
+
+        # Page navigation
+        col1, col2, col3 = st.columns([1, 1, 4])
+        with col1:
+            if st.button("← Previous", disabled=page == 0):
+                st.session_state.obs_page = page - 1
+                st.rerun()
+        with col2:
+            if st.button("Next →", disabled=offset + len(observations) >= total_rows):
+                st.session_state.obs_page = page + 1
+                st.rerun()
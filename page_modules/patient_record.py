@@ -4,10 +4,14 @@ Patient record view page
 
 import streamlit as st
 import pandas as pd
-from services.patient_service import get_patient_demographics, get_patient_registration_history
+from services.patient_service import get_selected_patient, get_patient_registration_history
 from services.record_service import get_observation_summary, get_patient_observations, calculate_date_range
-from utils.helpers import render_status_badge, format_date, format_boolean, safe_str, format_value_with_unit
-from config import DATE_RANGE_OPTIONS
+from utils.helpers import render_status_badge, render_html_grid, format_date, format_boolean, format_dates, format_values_with_units
+from page_modules._patient_sections import (
+    format_patient_text, build_registration_html, build_geography_html, build_language_html,
+    render_registration_history_table
+)
+from config import DATE_RANGE_OPTION_KEYS, MAX_OBSERVATIONS, CACHE_TTL_FAST, CACHE_TTL_SLOW
 
 
 def render_patient_record():
@@ -32,13 +36,12 @@ def render_patient_record():
         st.rerun()
 
     # Load patient demographics
-    demographics = get_patient_demographics(sk_patient_id)
+    patient = get_selected_patient(sk_patient_id)
 
-    if demographics.empty:
+    if patient is None:
         st.error("Failed to load patient demographics")
         return
 
-    patient = demographics.iloc[0]
     person_id = patient['PERSON_ID']  # Get person_id for queries
 
     # Render patient header
@@ -62,7 +65,7 @@ def render_patient_header(patient):
     Render patient header with demographics.
 
     Args:
-        patient: Patient demographics row
+        patient: Patient demographics dictionary
     """
     st.markdown('<div class="patient-header">', unsafe_allow_html=True)
 
@@ -82,131 +85,67 @@ def render_patient_header(patient):
 
     # Core demographics in tabs
     tab1, tab2, tab3, tab4 = st.tabs(["👤 Core Demographics", "🏥 Registration", "📍 Geography", "🗣️ Language"])
+    sections = build_demographics_html(patient)
 
     with tab1:
-        render_core_demographics(patient)
+        render_html_grid(sections["core"])
 
     with tab2:
-        render_registration_info(patient)
+        render_html_grid(sections["registration"])
 
     with tab3:
-        render_geography_info(patient)
+        render_html_grid(sections["geography"])
 
     with tab4:
-        render_language_info(patient)
+        render_html_grid(sections["language"])
 
     st.markdown('</div>', unsafe_allow_html=True)
 
 
-def render_core_demographics(patient):
-    """Render core demographics section."""
-    col1, col2, col3, col4 = st.columns(4)
-
-    with col1:
-        st.markdown("**Age**")
-        st.markdown(f"{safe_str(patient['AGE'])} years")
-        st.markdown(f"<small>Born: {safe_str(patient['BIRTH_YEAR'])}</small>", unsafe_allow_html=True)
-
-    with col2:
-        st.markdown("**Gender**")
-        st.markdown(safe_str(patient['GENDER']))
-
-    with col3:
-        st.markdown("**Ethnicity**")
-        st.markdown(safe_str(patient['ETHNICITY_SUBCATEGORY']))
-        st.markdown(f"<small>{safe_str(patient['ETHNICITY_CATEGORY'])}</small>", unsafe_allow_html=True)
-
-    with col4:
-        st.markdown("**Life Stage**")
-        st.markdown(safe_str(patient['AGE_LIFE_STAGE']))
-        st.markdown(f"<small>{safe_str(patient['AGE_BAND_NHS'])}</small>", unsafe_allow_html=True)
-
-    st.markdown("<br>", unsafe_allow_html=True)
-
-    col1, col2, col3 = st.columns(3)
-
-    with col1:
-        st.markdown("**Deceased**")
-        st.markdown(format_boolean(patient['IS_DECEASED']))
-        if patient['IS_DECEASED'] and patient['DEATH_YEAR']:
-            st.markdown(f"<small>Year: {safe_str(patient['DEATH_YEAR'])}</small>", unsafe_allow_html=True)
-
-    with col2:
-        st.markdown("**Dummy Patient**")
-        st.markdown(format_boolean(patient['IS_DUMMY_PATIENT']))
-
-    with col3:
-        st.markdown("**School Age**")
-        primary = format_boolean(patient['IS_PRIMARY_SCHOOL_AGE'])
-        secondary = format_boolean(patient['IS_SECONDARY_SCHOOL_AGE'])
-        st.markdown(f"Primary: {primary}")
-        st.markdown(f"Secondary: {secondary}")
-
-
-def render_registration_info(patient):
-    """Render registration information section."""
-    col1, col2 = st.columns(2)
-
-    with col1:
-        st.markdown("**Practice**")
-        st.markdown(safe_str(patient['PRACTICE_NAME']))
-        st.markdown(f"<small>Code: {safe_str(patient['PRACTICE_CODE'])}</small>", unsafe_allow_html=True)
-
-        st.markdown("<br>**PCN**", unsafe_allow_html=True)
-        st.markdown(safe_str(patient['PCN_NAME']))
-        st.markdown(f"<small>Code: {safe_str(patient['PCN_CODE'])}</small>", unsafe_allow_html=True)
-
-    with col2:
-        st.markdown("**Registration Dates**")
-        st.markdown(f"Start: {format_date(patient['REGISTRATION_START_DATE'])}")
-        st.markdown(f"End: {format_date(patient['REGISTRATION_END_DATE'])}")
-
-        st.markdown("<br>**ICB**", unsafe_allow_html=True)
-        st.markdown(safe_str(patient['ICB_NAME']))
-        st.markdown(f"<small>{safe_str(patient['BOROUGH_REGISTERED'])}</small>", unsafe_allow_html=True)
-
-
-def render_geography_info(patient):
-    """Render geography information section."""
-    col1, col2 = st.columns(2)
-
-    with col1:
-        st.markdown("**Resident Location**")
-        st.markdown(f"Borough: {safe_str(patient['BOROUGH_RESIDENT'])}")
-        st.markdown(f"ICB: {safe_str(patient['ICB_RESIDENT'])}")
-        st.markdown(f"Local Authority: {safe_str(patient['LOCAL_AUTHORITY_NAME'])}")
-        st.markdown(f"London Resident: {format_boolean(patient['IS_LONDON_RESIDENT'])}")
-
-    with col2:
-        st.markdown("**Area Classifications**")
-        st.markdown(f"Neighbourhood: {safe_str(patient['NEIGHBOURHOOD_RESIDENT'])}")
-        st.markdown(f"LSOA: {safe_str(patient['LSOA_NAME_21'])}")
-        st.markdown(f"Ward: {safe_str(patient['WARD_NAME'])}")
-
-    st.markdown("<br>", unsafe_allow_html=True)
-
-    col1, col2 = st.columns(2)
-
-    with col1:
-        st.markdown("**Deprivation (IMD 2019)**")
-        st.markdown(f"Quintile: {safe_str(patient['IMD_QUINTILE_19'])}")
-        st.markdown(f"Decile: {safe_str(patient['IMD_DECILE_19'])}")
-
-
-def render_language_info(patient):
-    """Render language information section."""
-    col1, col2 = st.columns(2)
+@st.cache_data(ttl=CACHE_TTL_SLOW, show_spinner=False)
+def build_demographics_html(patient):
+    """
+    Build the HTML for the demographics tabs.
+    Cached per patient, so reruns only emit the pre-built grids.
 
-    with col1:
-        st.markdown("**Main Language**")
-        st.markdown(safe_str(patient['MAIN_LANGUAGE']))
-        st.markdown(f"<small>Type: {safe_str(patient['LANGUAGE_TYPE'])}</small>", unsafe_allow_html=True)
+    Args:
+        patient: Patient demographics dictionary
 
-    with col2:
-        st.markdown("**Interpreter**")
-        st.markdown(f"Needed: {format_boolean(patient['INTERPRETER_NEEDED'])}")
-        if patient['INTERPRETER_NEEDED']:
-            st.markdown(f"Type: {safe_str(patient['INTERPRETER_TYPE'])}")
+    Returns:
+        Dictionary of tab name to rows of column HTML (see render_html_grid)
+    """
+    text = format_patient_text(patient)
+
+    deceased = f"<strong>Deceased</strong><br>{format_boolean(patient['IS_DECEASED'])}"
+    if patient['IS_DECEASED'] and patient['DEATH_YEAR']:
+        deceased += f"<br><small>Year: {text['DEATH_YEAR']}</small>"
+
+    return {
+        "core": [
+            [
+                f"<strong>Age</strong><br>"
+                f"{text['AGE']} years<br>"
+                f"<small>Born: {text['BIRTH_YEAR']}</small>",
+                f"<strong>Gender</strong><br>{text['GENDER']}",
+                f"<strong>Ethnicity</strong><br>"
+                f"{text['ETHNICITY_SUBCATEGORY']}<br>"
+                f"<small>{text['ETHNICITY_CATEGORY']}</small>",
+                f"<strong>Life Stage</strong><br>"
+                f"{text['AGE_LIFE_STAGE']}<br>"
+                f"<small>{text['AGE_BAND_NHS']}</small>"
+            ],
+            [
+                deceased,
+                f"<strong>Dummy Patient</strong><br>{format_boolean(patient['IS_DUMMY_PATIENT'])}",
+                f"<strong>School Age</strong><br>"
+                f"Primary: {format_boolean(patient['IS_PRIMARY_SCHOOL_AGE'])}<br>"
+                f"Secondary: {format_boolean(patient['IS_SECONDARY_SCHOOL_AGE'])}"
+            ]
+        ],
+        "registration": build_registration_html(patient, text),
+        "geography": build_geography_html(patient, text),
+        "language": build_language_html(patient, text)
+    }
 
 
 def render_summary_metrics(summary, patient):
@@ -251,42 +190,43 @@ def render_registration_history(sk_patient_id):
             st.info("No registration history available")
         else:
             st.markdown(f"**{len(history)} registration periods found**")
-            st.markdown("<br>", unsafe_allow_html=True)
-
-            for idx, row in history.iterrows():
-                current_badge = " 🟢 **CURRENT**" if row['IS_CURRENT'] else ""
-                active_status = "Active" if row['IS_ACTIVE'] else "Inactive"
-
-                st.markdown(f"#### Period {row['PERIOD_SEQUENCE']}{current_badge}")
-
-                col1, col2 = st.columns(2)
 
-                with col1:
-                    st.markdown(f"**Effective Dates**")
-                    st.markdown(f"Start: {format_date(row['EFFECTIVE_START_DATE'])}")
-                    st.markdown(f"End: {format_date(row['EFFECTIVE_END_DATE'])}")
+            render_registration_history_table(history)
 
-                    st.markdown(f"<br>**Registration**", unsafe_allow_html=True)
-                    st.markdown(f"Start: {format_date(row['REGISTRATION_START_DATE'])}")
-                    st.markdown(f"End: {format_date(row['REGISTRATION_END_DATE'])}")
-                    st.markdown(f"Status: {active_status}")
 
-                with col2:
-                    st.markdown(f"**Practice**")
-                    st.markdown(f"{safe_str(row['PRACTICE_NAME'])}")
-                    st.markdown(f"<small>Code: {safe_str(row['PRACTICE_CODE'])}</small>", unsafe_allow_html=True)
+@st.cache_data(ttl=CACHE_TTL_FAST, show_spinner=False)
+def prepare_observations_display(observations):
+    """
+    Prepare observations dataframe for display.
+    Cached on the observations frame, so reruns that leave it unchanged
+    reuse the formatted frame.
 
-                    st.markdown(f"<br>**Location**", unsafe_allow_html=True)
-                    st.markdown(f"PCN: {safe_str(row['PCN_NAME'])}")
-                    st.markdown(f"Borough: {safe_str(row['BOROUGH_REGISTERED'])}")
+    Args:
+        observations: DataFrame with observation data
 
-                if idx < len(history) - 1:
-                    st.markdown("---")
+    Returns:
+        Formatted DataFrame ready for display
+    """
+    # Build the display frame directly from the formatted columns (no
+    # copy of the source frame), preferring numeric value if present
+    return pd.DataFrame({
+        'Date': format_dates(observations['CLINICAL_EFFECTIVE_DATE']),
+        'SNOMED Code': observations['MAPPED_CONCEPT_CODE'],
+        'Description': observations['MAPPED_CONCEPT_DISPLAY'],
+        'Value': format_values_with_units(
+            observations['RESULT_VALUE'].astype(object).where(
+                observations['RESULT_VALUE'].notna(), observations['RESULT_TEXT']
+            ),
+            observations['RESULT_UNIT_DISPLAY']
+        )
+    })
 
 
+@st.fragment
 def render_observations_section(person_id):
     """
     Render observations section with filters and table.
+    Runs as a fragment so changing the filters only reruns this section.
 
     Args:
         person_id: Patient identifier
@@ -300,7 +240,7 @@ def render_observations_section(person_id):
     with col1:
         date_range = st.selectbox(
             "Date Range",
-            options=list(DATE_RANGE_OPTIONS.keys()),
+            options=DATE_RANGE_OPTION_KEYS,
             index=0
         )
 
@@ -321,29 +261,9 @@ def render_observations_section(person_id):
     if observations.empty:
         st.info("No observations found for the selected filters")
     else:
-        st.markdown(f"**Showing {len(observations):,} observations** (limited to 10,000 most recent)")
-
-        # Prepare display dataframe
-        display_df = observations.copy()
-        display_df['CLINICAL_EFFECTIVE_DATE'] = display_df['CLINICAL_EFFECTIVE_DATE'].apply(format_date)
-
-        # Combine result_value and result_text, preferring numeric value if present
-        display_df['VALUE'] = display_df.apply(
-            lambda row: format_value_with_unit(
-                row['RESULT_VALUE'] if pd.notna(row['RESULT_VALUE']) else row['RESULT_TEXT'],
-                row['RESULT_UNIT_DISPLAY']
-            ),
-            axis=1
-        )
+        st.markdown(f"**Showing {len(observations):,} observations** (limited to {MAX_OBSERVATIONS:,} most recent)")
 
-        # Select and rename columns for display
-        display_df = display_df[[
-            'CLINICAL_EFFECTIVE_DATE',
-            'MAPPED_CONCEPT_CODE',
-            'MAPPED_CONCEPT_DISPLAY',
-            'VALUE'
-        ]]
-        display_df.columns = ['Date', 'SNOMED Code', 'Description', 'Value']
+        display_df = prepare_observations_display(observations)
 
         # Display table
         st.dataframe(
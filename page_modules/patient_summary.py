@@ -4,11 +4,17 @@ Patient summary page - landing page when viewing a patient record
 
 import streamlit as st
 import pandas as pd
-import altair as alt
-from datetime import datetime
-from services.patient_service import get_patient_demographics, get_patient_registration_history, get_patient_ltc_summary
-from services.record_service import get_observation_summary, get_medication_summary, get_appointment_summary
-from utils.helpers import render_status_badge, get_status_badge_html, format_date, format_boolean, safe_str, format_month_year
+from services.patient_service import get_selected_patient, get_patient_registration_history, get_patient_ltc_summary, get_selected_person_id
+from services.record_service import get_patient_summary_metrics
+from page_modules._patient_sections import (
+    format_patient_text, build_registration_html, build_geography_html, build_language_html,
+    render_registration_history_table
+)
+from utils.helpers import render_status_badge, render_html_grid, get_status_badge_html, format_date, format_dates, format_boolean, safe_str, format_month_year
+
+
+# Inline badge appended to QOF-registered long-term conditions
+QOF_BADGE_HTML = ' <span class="qof-badge">QOF</span>'
 
 
 def render_patient_summary():
@@ -28,20 +34,18 @@ def render_patient_summary():
 
     # Load patient data with spinner (before showing any UI)
     with st.spinner("Loading patient summary..."):
-        # Load patient demographics
-        demographics = get_patient_demographics(sk_patient_id)
-
-        if demographics.empty:
+        # person_id and the demographics row are kept in session state; the
+        # remaining queries are cached per patient, so reruns are served from
+        # the cache
+        person_id = get_selected_person_id(sk_patient_id)
+        patient = get_selected_patient(sk_patient_id) if person_id else None
+        if patient is None:
             st.error("Failed to load patient demographics")
             return
 
-        patient = demographics.iloc[0]
-        person_id = patient['PERSON_ID']  # Get person_id for queries that need it
-
-        # Get observation, medication, and appointment summaries
-        obs_summary = get_observation_summary(person_id)
-        med_summary = get_medication_summary(person_id)
-        appt_summary = get_appointment_summary(person_id)
+        metrics = get_patient_summary_metrics(person_id)
+        history = get_patient_registration_history(sk_patient_id)
+        ltc_data = get_patient_ltc_summary(sk_patient_id)
 
     # Back button
     if st.button("← Back to Search"):
@@ -53,56 +57,67 @@ def render_patient_summary():
     render_patient_header(patient)
 
     # Render summary metrics
-    render_summary_metrics(obs_summary, med_summary, appt_summary, patient)
+    render_summary_metrics(metrics, patient)
 
     st.markdown("<br>", unsafe_allow_html=True)
 
     # Navigation buttons to different views
-    col1, col2, col3 = st.columns(3)
-
-    with col1:
-        if st.button("📊 View Observations", use_container_width=True, type="primary"):
-            st.session_state.page = "observations"
-            st.rerun()
-
-    with col2:
-        if st.button("💊 View Medications", use_container_width=True, type="primary"):
-            st.session_state.page = "medications"
-            st.rerun()
-
-    with col3:
-        if st.button("📅 View Appointments", use_container_width=True, type="primary"):
-            st.session_state.page = "appointments"
-            st.rerun()
+    render_navigation()
 
     st.markdown("<br>", unsafe_allow_html=True)
 
-    # Demographics details in tabs
+    # Demographics details in tabs (fields formatted once for all tabs)
+    text = format_patient_text(patient)
     tab1, tab2, tab3, tab4 = st.tabs(["👤 Core Demographics", "🏥 Registration", "📍 Geography", "🗣️ Language"])
 
     with tab1:
-        render_core_demographics(patient)
+        render_html_grid(build_core_demographics_html(patient, text))
 
     with tab2:
-        render_registration_info(patient)
+        render_html_grid(build_registration_html(patient, text))
         st.markdown("<br>", unsafe_allow_html=True)
-        render_registration_history(sk_patient_id)
+        render_registration_history(history)
 
     with tab3:
-        render_geography_info(patient)
+        render_html_grid(build_geography_html(patient, text))
 
     with tab4:
-        render_language_info(patient)
+        render_html_grid(build_language_html(patient, text))
 
     st.markdown("<br>", unsafe_allow_html=True)
 
     # Long-term conditions summary
-    render_ltc_summary(sk_patient_id)
+    render_ltc_summary(ltc_data)
 
     st.markdown("<br>", unsafe_allow_html=True)
 
     # Problems section (lazy loaded)
-    render_problems_summary(sk_patient_id)
+    render_problems_summary(person_id)
+
+
+@st.fragment
+def render_navigation():
+    """
+    Render navigation buttons to the observations, medications and appointments views.
+    Runs as a fragment so a click reruns only these buttons before switching
+    page, rather than the whole summary first.
+    """
+    col1, col2, col3 = st.columns(3)
+
+    with col1:
+        if st.button("📊 View Observations", use_container_width=True, type="primary"):
+            st.session_state.page = "observations"
+            st.rerun()
+
+    with col2:
+        if st.button("💊 View Medications", use_container_width=True, type="primary"):
+            st.session_state.page = "medications"
+            st.rerun()
+
+    with col3:
+        if st.button("📅 View Appointments", use_container_width=True, type="primary"):
+            st.session_state.page = "appointments"
+            st.rerun()
 
 
 def render_patient_header(patient):
@@ -124,14 +139,12 @@ def render_patient_header(patient):
     st.markdown(f"**Person ID:** {patient['PERSON_ID']}")
 
 
-def render_summary_metrics(obs_summary, med_summary, appt_summary, patient):
+def render_summary_metrics(metrics, patient):
     """
     Render summary metrics.
 
     Args:
-        obs_summary: Observation summary dictionary
-        med_summary: Medication summary dictionary
-        appt_summary: Appointment summary dictionary
+        metrics: Summary metrics dictionary from get_patient_summary_metrics
         patient: Patient demographics row
     """
     st.markdown("### Record Summary")
@@ -139,159 +152,78 @@ def render_summary_metrics(obs_summary, med_summary, appt_summary, patient):
     col1, col2, col3, col4 = st.columns(4)
 
     with col1:
-        st.metric("Observations", f"{obs_summary['total_observations']:,}")
+        st.metric("Observations", f"{metrics['total_observations']:,}")
 
     with col2:
-        current_count = med_summary['current_medications']
-        total_count = med_summary['total_medications']
-        st.metric("Medications (Current)", f"{current_count:,}")
-        st.caption(f"Total: {total_count:,}")
+        st.metric("Medications (Current)", f"{metrics['current_medications']:,}")
+        st.caption(f"Total: {metrics['total_medications']:,}")
 
     with col3:
-        appts_12m = appt_summary['appointments_last_12m']
-        total_appts = appt_summary['total_appointments']
-        st.metric("Appointments (12m)", f"{appts_12m:,}")
-        st.caption(f"All time: {total_appts:,}")
+        st.metric("Appointments (12m)", f"{metrics['appointments_last_12m']:,}")
+        st.caption(f"All time: {metrics['total_appointments']:,}")
 
     with col4:
-        most_recent_obs = obs_summary['most_recent_date']
-        most_recent_med = med_summary['most_recent_date']
-        most_recent_appt = appt_summary['most_recent_date']
-        most_recent = max(filter(None, [most_recent_obs, most_recent_med, most_recent_appt]), default=None)
-        most_recent_str = format_date(most_recent) if most_recent else "N/A"
+        most_recent = metrics['most_recent_date']
+        most_recent_str = format_date(most_recent) if pd.notna(most_recent) else "N/A"
         st.metric("Most Recent", most_recent_str)
 
 
-def render_core_demographics(patient):
-    """Render core demographics section."""
-    # Row 1: Personal demographics
-    col1, col2, col3 = st.columns(3)
-
-    with col1:
-        st.markdown("**Age**")
-        life_stage = safe_str(patient['AGE_LIFE_STAGE'])
-        st.markdown(f"{safe_str(patient['AGE'])} years ({life_stage})")
-        birth_date = format_month_year(patient['BIRTH_DATE_APPROX'])
-        st.markdown(f"<small>Born: {birth_date}</small>", unsafe_allow_html=True)
-
-    with col2:
-        st.markdown("**Gender**")
-        st.markdown(safe_str(patient['GENDER']))
-
-    with col3:
-        st.markdown("**Ethnicity**")
-        st.markdown(safe_str(patient['ETHNICITY_SUBCATEGORY']))
-        st.markdown(f"<small>{safe_str(patient['ETHNICITY_CATEGORY'])}</small>", unsafe_allow_html=True)
-
-    st.markdown("<br>", unsafe_allow_html=True)
-
-    # Row 2: Practice and deceased status
-    col1, col2, col3 = st.columns(3)
-
-    with col1:
-        st.markdown("**GP Practice**")
-        st.markdown(safe_str(patient['PRACTICE_NAME']))
-        st.markdown(f"<small>Code: {safe_str(patient['PRACTICE_CODE'])}</small>", unsafe_allow_html=True)
+def build_core_demographics_html(patient, text):
+    """
+    Build the HTML for the core demographics section.
 
-    with col2:
-        st.markdown("**PCN**")
-        st.markdown(safe_str(patient['PCN_NAME']))
+    Args:
+        patient: Patient demographics dictionary
+        text: Pre-formatted patient text fields (see format_patient_text)
 
-    with col3:
-        st.markdown("**Deceased**")
-        st.markdown(format_boolean(patient['IS_DECEASED']))
-        if patient['IS_DECEASED'] and patient['DEATH_DATE_APPROX']:
-            death_date = format_month_year(patient['DEATH_DATE_APPROX'])
-            st.markdown(f"<small>Died: {death_date}</small>", unsafe_allow_html=True)
+    Returns:
+        Rows of column HTML (see render_html_grid)
+    """
+    deceased = f"<strong>Deceased</strong><br>{format_boolean(patient['IS_DECEASED'])}"
+    if patient['IS_DECEASED'] and patient['DEATH_DATE_APPROX']:
+        deceased += f"<br><small>Died: {format_month_year(patient['DEATH_DATE_APPROX'])}</small>"
+
+    rows = [
+        # Row 1: Personal demographics
+        [
+            f"<strong>Age</strong><br>"
+            f"{text['AGE']} years ({text['AGE_LIFE_STAGE']})<br>"
+            f"<small>Born: {format_month_year(patient['BIRTH_DATE_APPROX'])}</small>",
+            f"<strong>Gender</strong><br>{text['GENDER']}",
+            f"<strong>Ethnicity</strong><br>"
+            f"{text['ETHNICITY_SUBCATEGORY']}<br>"
+            f"<small>{text['ETHNICITY_CATEGORY']}</small>"
+        ],
+        # Row 2: Practice and deceased status
+        [
+            f"<strong>GP Practice</strong><br>"
+            f"{text['PRACTICE_NAME']}<br>"
+            f"<small>Code: {text['PRACTICE_CODE']}</small>",
+            f"<strong>PCN</strong><br>{text['PCN_NAME']}",
+            deceased
+        ]
+    ]
 
     # Row 3: School age (only if under 18)
     if patient['AGE'] < 18:
-        st.markdown("<br>", unsafe_allow_html=True)
-        col1, col2, col3 = st.columns(3)
-
-        with col1:
-            st.markdown("**School Age**")
-            primary = format_boolean(patient['IS_PRIMARY_SCHOOL_AGE'])
-            secondary = format_boolean(patient['IS_SECONDARY_SCHOOL_AGE'])
-            st.markdown(f"Primary: {primary}")
-            st.markdown(f"Secondary: {secondary}")
-
-
-def render_registration_info(patient):
-    """Render registration information section."""
-    col1, col2 = st.columns(2)
-
-    with col1:
-        st.markdown("**Practice**")
-        st.markdown(safe_str(patient['PRACTICE_NAME']))
-        st.markdown(f"<small>Code: {safe_str(patient['PRACTICE_CODE'])}</small>", unsafe_allow_html=True)
-
-        st.markdown("<br>**PCN**", unsafe_allow_html=True)
-        st.markdown(safe_str(patient['PCN_NAME']))
-        st.markdown(f"<small>Code: {safe_str(patient['PCN_CODE'])}</small>", unsafe_allow_html=True)
-
-    with col2:
-        st.markdown("**Registration Dates**")
-        st.markdown(f"Start: {format_date(patient['REGISTRATION_START_DATE'])}")
-        st.markdown(f"End: {format_date(patient['REGISTRATION_END_DATE'])}")
-
-        st.markdown("<br>**ICB**", unsafe_allow_html=True)
-        st.markdown(safe_str(patient['ICB_NAME']))
-        st.markdown(f"<small>{safe_str(patient['BOROUGH_REGISTERED'])}</small>", unsafe_allow_html=True)
-
-
-def render_geography_info(patient):
-    """Render geography information section."""
-    col1, col2 = st.columns(2)
-
-    with col1:
-        st.markdown("**Resident Location**")
-        st.markdown(f"Borough: {safe_str(patient['BOROUGH_RESIDENT'])}")
-        st.markdown(f"ICB: {safe_str(patient['ICB_RESIDENT'])}")
-        st.markdown(f"Local Authority: {safe_str(patient['LOCAL_AUTHORITY_NAME'])}")
-        st.markdown(f"London Resident: {format_boolean(patient['IS_LONDON_RESIDENT'])}")
-
-    with col2:
-        st.markdown("**Area Classifications**")
-        st.markdown(f"Neighbourhood: {safe_str(patient['NEIGHBOURHOOD_RESIDENT'])}")
-        st.markdown(f"LSOA: {safe_str(patient['LSOA_NAME_21'])}")
-        st.markdown(f"Ward: {safe_str(patient['WARD_NAME'])}")
-
-    st.markdown("<br>", unsafe_allow_html=True)
-
-    col1, col2 = st.columns(2)
-
-    with col1:
-        st.markdown("**Deprivation (IMD 2019)**")
-        st.markdown(f"Quintile: {safe_str(patient['IMD_QUINTILE_19'])}")
-        st.markdown(f"Decile: {safe_str(patient['IMD_DECILE_19'])}")
-
-
-def render_language_info(patient):
-    """Render language information section."""
-    col1, col2 = st.columns(2)
+        rows.append([
+            f"<strong>School Age</strong><br>"
+            f"Primary: {format_boolean(patient['IS_PRIMARY_SCHOOL_AGE'])}<br>"
+            f"Secondary: {format_boolean(patient['IS_SECONDARY_SCHOOL_AGE'])}",
+            None,
+            None
+        ])
 
-    with col1:
-        st.markdown("**Main Language**")
-        st.markdown(safe_str(patient['MAIN_LANGUAGE']))
-        st.markdown(f"<small>Type: {safe_str(patient['LANGUAGE_TYPE'])}</small>", unsafe_allow_html=True)
-
-    with col2:
-        st.markdown("**Interpreter**")
-        st.markdown(f"Needed: {format_boolean(patient['INTERPRETER_NEEDED'])}")
-        if patient['INTERPRETER_NEEDED']:
-            st.markdown(f"Type: {safe_str(patient['INTERPRETER_TYPE'])}")
+    return rows
 
 
-def render_registration_history(sk_patient_id):
+def render_registration_history(history):
     """
     Render registration history as a markdown list.
 
     Args:
-        sk_patient_id: Patient identifier (sk_patient_id)
+        history: DataFrame with registration history
     """
-    history = get_patient_registration_history(sk_patient_id)
-
     if history.empty:
         st.info("No registration history available")
         return
@@ -303,127 +235,74 @@ def render_registration_history(sk_patient_id):
     
     st.markdown("### Registration History")
     
-    # Display as bullet points
-    for idx, row in history.iterrows():
-        effective_start = format_date(row['EFFECTIVE_START_DATE'])
-        
-        # Handle end date - check for NaT/None properly
-        end_date = row['EFFECTIVE_END_DATE']
-        if pd.isna(end_date) or end_date is None:
-            effective_end = "Ongoing"
-        else:
-            effective_end = format_date(end_date)
-            if effective_end == "N/A":
-                effective_end = "Ongoing"
-        
-        practice_name = safe_str(row['PRACTICE_NAME'])
-        practice_code = safe_str(row['PRACTICE_CODE'])
-        
-        # Build the bullet point text
-        bullet_text = f"**Period {row['PERIOD_SEQUENCE']}**: "
-        bullet_text += f"{effective_start} → {effective_end}"
-        bullet_text += f" | {practice_name}"
-        
-        if practice_code and practice_code != "N/A":
-            bullet_text += f" ({practice_code})"
-        
-        # Add current badge at the end if current
-        if row['IS_CURRENT']:
-            bullet_text += ' <span style="background-color: #28a745; color: white; padding: 2px 8px; border-radius: 4px; font-size: 0.85em; font-weight: 600;">CURRENT</span>'
-        
-        st.markdown(f"- {bullet_text}", unsafe_allow_html=True)
+    # Build the bullet list column-wise and render it as one markdown element
+    effective_start = format_dates(history['EFFECTIVE_START_DATE'])
+    effective_end = format_dates(history['EFFECTIVE_END_DATE']).replace("N/A", "Ongoing")
+    practice_code = history['PRACTICE_CODE'].apply(safe_str)
+    practice_code = (" (" + practice_code + ")").where(practice_code.ne("N/A"), "")
+    current_badge = pd.Series(
+        ' <span style="background-color: #28a745; color: white; padding: 2px 8px; border-radius: 4px; font-size: 0.85em; font-weight: 600;">CURRENT</span>',
+        index=history.index
+    ).where(history['IS_CURRENT'].fillna(False).astype(bool), "")
+
+    bullets = (
+        "- **Period " + history['PERIOD_SEQUENCE'].astype(str) + "**: "
+        + effective_start + " → " + effective_end
+        + " | " + history['PRACTICE_NAME'].apply(safe_str) + practice_code
+        + current_badge
+    )
+    st.markdown("\n".join(bullets), unsafe_allow_html=True)
     
     st.caption(f"Showing {total_periods} registration period(s)")
     st.markdown("<br>", unsafe_allow_html=True)
     
     # Detailed history in expandable section
     with st.expander("📜 View Detailed Registration History", expanded=False):
-        for idx, row in history.iterrows():
-            current_badge = " 🟢 **CURRENT**" if row['IS_CURRENT'] else ""
-            active_status = "Active" if row['IS_ACTIVE'] else "Inactive"
-
-            st.markdown(f"#### Period {row['PERIOD_SEQUENCE']}{current_badge}")
-
-            col1, col2 = st.columns(2)
+        render_registration_history_table(history)
 
-            with col1:
-                st.markdown(f"**Effective Dates**")
-                st.markdown(f"Start: {format_date(row['EFFECTIVE_START_DATE'])}")
-                st.markdown(f"End: {format_date(row['EFFECTIVE_END_DATE'])}")
 
-                st.markdown(f"<br>**Registration**", unsafe_allow_html=True)
-                st.markdown(f"Start: {format_date(row['REGISTRATION_START_DATE'])}")
-                st.markdown(f"End: {format_date(row['REGISTRATION_END_DATE'])}")
-                st.markdown(f"Status: {active_status}")
-
-            with col2:
-                st.markdown(f"**Practice**")
-                st.markdown(f"{safe_str(row['PRACTICE_NAME'])}")
-                st.markdown(f"<small>Code: {safe_str(row['PRACTICE_CODE'])}</small>", unsafe_allow_html=True)
-
-                st.markdown(f"<br>**Location**", unsafe_allow_html=True)
-                st.markdown(f"PCN: {safe_str(row['PCN_NAME'])}")
-                st.markdown(f"Borough: {safe_str(row['BOROUGH_REGISTERED'])}")
-
-            if idx < len(history) - 1:
-                st.markdown("---")
-
-
-def render_ltc_summary(sk_patient_id):
+def render_ltc_summary(ltc_data):
     """
     Render long-term conditions summary section.
 
     Args:
-        sk_patient_id: Patient identifier (sk_patient_id)
+        ltc_data: DataFrame with LTC conditions
     """
-    ltc_data = get_patient_ltc_summary(sk_patient_id)
-
     if ltc_data.empty:
         return
 
     st.markdown("### 🏥 Long-Term Conditions")
 
-    # Group by clinical domain
-    domains = ltc_data['CLINICAL_DOMAIN'].unique()
-
-    for domain in sorted(domains):
-        domain_conditions = ltc_data[ltc_data['CLINICAL_DOMAIN'] == domain]
-
-        st.markdown(f"**{domain}**")
-
-        # Display conditions as badges
-        badges_html = ""
-        for _, condition in domain_conditions.iterrows():
-            qof_class = "condition-qof" if condition['IS_QOF'] else "condition-other"
-            qof_badge = ' <span style="background-color: #084298; color: white; padding: 2px 6px; border-radius: 3px; font-size: 0.75rem; margin-left: 4px;">QOF</span>' if condition['IS_QOF'] else ""
-            earliest = format_date(condition['EARLIEST_DIAGNOSIS_DATE'])
-
-            badges_html += f'<span class="condition-badge {qof_class}">{condition["CONDITION_NAME"]}{qof_badge}<br><small>Dx: {earliest}</small></span>'
+    # Build every condition badge column-wise up front
+    is_qof = ltc_data['IS_QOF'].fillna(False).astype(bool)
+    badges = (
+        '<span class="condition-badge '
+        + is_qof.map({True: "condition-qof", False: "condition-other"})
+        + '">' + ltc_data['CONDITION_NAME'].astype(str)
+        + is_qof.map({True: QOF_BADGE_HTML, False: ""})
+        + '<br><small>Dx: ' + format_dates(ltc_data['EARLIEST_DIAGNOSIS_DATE'])
+        + '</small></span>'
+    )
 
-        st.markdown(badges_html, unsafe_allow_html=True)
-        st.markdown("")
+    # One markdown element per clinical domain (groups come back sorted by domain)
+    for domain, domain_badges in badges.groupby(ltc_data['CLINICAL_DOMAIN'], sort=True):
+        st.markdown(f"**{domain}**\n\n{domain_badges.str.cat()}", unsafe_allow_html=True)
 
 
-def render_problems_summary(sk_patient_id):
+def render_problems_summary(person_id):
     """
     Render problems summary section (lazy loaded).
 
     Args:
-        sk_patient_id: Patient identifier (sk_patient_id)
+        person_id: Patient identifier (person_id)
     """
+    from datetime import datetime
     from services.record_service import get_patient_problems
-    from services.patient_service import get_patient_demographics
     from utils.helpers import format_practitioner_name, safe_str
     
     with st.expander("🏥 Problems (Active & Past)", expanded=False):
         with st.spinner("Loading problems..."):
-            # Get person_id from sk_patient_id for the query
-            demographics = get_patient_demographics(sk_patient_id)
-            if not demographics.empty:
-                person_id = demographics.iloc[0]['PERSON_ID']
-                problems = get_patient_problems(person_id)
-            else:
-                problems = pd.DataFrame()
+            problems = get_patient_problems(person_id)
 
         if problems.empty:
             st.info("No problems found")
@@ -454,14 +333,14 @@ def render_problems_summary(sk_patient_id):
             # Prepare display dataframe
             display_df = active_problems.copy()
             display_df['DATE_DISPLAY'] = display_df['CLINICAL_EFFECTIVE_DATE'].apply(format_date)
-            display_df['PRACTITIONER'] = display_df.apply(
-                lambda row: format_practitioner_name(
-                    row['PRACTITIONER_LAST_NAME'],
-                    row['PRACTITIONER_FIRST_NAME'],
-                    row['PRACTITIONER_TITLE']
-                ),
-                axis=1
-            )
+            display_df['PRACTITIONER'] = [
+                format_practitioner_name(last_name, first_name, title)
+                for last_name, first_name, title in display_df[[
+                    'PRACTITIONER_LAST_NAME',
+                    'PRACTITIONER_FIRST_NAME',
+                    'PRACTITIONER_TITLE'
+                ]].itertuples(index=False, name=None)
+            ]
             
             display_df = display_df[[
                 'DATE_DISPLAY',
@@ -489,14 +368,14 @@ def render_problems_summary(sk_patient_id):
             # Prepare display dataframe
             display_df = past_problems.copy()
             display_df['DATE_DISPLAY'] = display_df['CLINICAL_EFFECTIVE_DATE'].apply(format_date)
-            display_df['PRACTITIONER'] = display_df.apply(
-                lambda row: format_practitioner_name(
-                    row['PRACTITIONER_LAST_NAME'],
-                    row['PRACTITIONER_FIRST_NAME'],
-                    row['PRACTITIONER_TITLE']
-                ),
-                axis=1
-            )
+            display_df['PRACTITIONER'] = [
+                format_practitioner_name(last_name, first_name, title)
+                for last_name, first_name, title in display_df[[
+                    'PRACTITIONER_LAST_NAME',
+                    'PRACTITIONER_FIRST_NAME',
+                    'PRACTITIONER_TITLE'
+                ]].itertuples(index=False, name=None)
+            ]
             
             display_df = display_df[[
                 'DATE_DISPLAY',
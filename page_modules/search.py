@@ -117,6 +117,8 @@ def render_patient_card(patient_row):
             if st.button("View Record", key=f"view_{patient_row['SK_PATIENT_ID']}", type="primary", use_container_width=True):
                 st.session_state.page = "patient_summary"
                 st.session_state.selected_patient = patient_row["SK_PATIENT_ID"]
+                st.session_state.selected_person_id = patient_row["PERSON_ID"]
+                st.session_state.selected_person_id_sk = patient_row["SK_PATIENT_ID"]
                 st.rerun()
             st.markdown("</div>", unsafe_allow_html=True)
 
@@ -4,7 +4,7 @@ Patient search and demographics service
 
 import streamlit as st
 import pandas as pd
-from config import TABLE_DIM_PERSON, TABLE_DIM_PERSON_HISTORICAL, TABLE_LTC_SUMMARY
+from config import TABLE_DIM_PERSON, TABLE_DIM_PERSON_HISTORICAL, TABLE_LTC_SUMMARY, CACHE_TTL_SLOW
 from database import get_connection
 
 
@@ -66,9 +66,11 @@ def search_patient(search_term):
         return pd.DataFrame()
 
 
+@st.cache_data(ttl=CACHE_TTL_SLOW, show_spinner=False)
 def get_patient_demographics(sk_patient_id):
     """
     Get full demographics for a patient.
+    Results are cached per sk_patient_id.
 
     Args:
         sk_patient_id: Patient identifier (sk_patient_id)
@@ -95,9 +97,63 @@ def get_patient_demographics(sk_patient_id):
         return pd.DataFrame()
 
 
+def get_selected_patient(sk_patient_id):
+    """
+    Get demographics for the selected patient as a dictionary.
+
+    The extracted row is kept in session state, keyed by sk_patient_id,
+    so reruns for the same patient skip the lookup and row extraction.
+
+    Args:
+        sk_patient_id: Patient identifier (sk_patient_id)
+
+    Returns:
+        Dictionary of demographics columns, or None if the patient could not be found
+    """
+    if st.session_state.get("selected_patient_record_id") != sk_patient_id:
+        demographics = get_patient_demographics(sk_patient_id)
+        if demographics.empty:
+            return None
+
+        st.session_state.selected_patient_record = demographics.iloc[0].to_dict()
+        st.session_state.selected_patient_record_id = sk_patient_id
+
+    return st.session_state.selected_patient_record
+
+
+def get_selected_person_id(sk_patient_id):
+    """
+    Get person_id for the selected patient.
+
+    Uses the person_id stored in session state when the patient was
+    selected, as long as it was stored for this sk_patient_id, falling
+    back to a demographics lookup.
+
+    Args:
+        sk_patient_id: Patient identifier (sk_patient_id)
+
+    Returns:
+        person_id, or None if the patient could not be found
+    """
+    person_id = st.session_state.get("selected_person_id")
+    if person_id and st.session_state.get("selected_person_id_sk") == sk_patient_id:
+        return person_id
+
+    demographics = get_patient_demographics(sk_patient_id)
+    if demographics.empty:
+        return None
+
+    person_id = demographics.iloc[0]['PERSON_ID']
+    st.session_state.selected_person_id = person_id
+    st.session_state.selected_person_id_sk = sk_patient_id
+    return person_id
+
+
+@st.cache_data(ttl=CACHE_TTL_SLOW, show_spinner=False)
 def get_patient_registration_history(sk_patient_id):
     """
     Get registration history for a patient from historical table.
+    Results are cached per sk_patient_id.
 
     Args:
         sk_patient_id: Patient identifier (sk_patient_id)
@@ -148,9 +204,12 @@ def get_patient_registration_history(sk_patient_id):
         st.warning(f"Could not load registration history: {str(e)}")
         return pd.DataFrame()
 
+
+@st.cache_data(ttl=CACHE_TTL_SLOW, show_spinner=False)
 def get_patient_ltc_summary(sk_patient_id):
     """
     Get long-term conditions summary for a patient.
+    Results are cached per sk_patient_id.
 
     Args:
         sk_patient_id: Patient identifier (sk_patient_id)
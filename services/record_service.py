@@ -5,23 +5,79 @@ Patient records service for observations and medications
 import streamlit as st
 import pandas as pd
 from datetime import datetime, timedelta
-from config import TABLE_OBSERVATION, TABLE_MEDICATION_ORDER, TABLE_MEDICATION_STATEMENT, TABLE_PRACTITIONER, TABLE_CONCEPT, TABLE_CONCEPT_MAP, MAX_OBSERVATIONS
+from itertools import chain
+from config import (
+    TABLE_OBSERVATION, TABLE_MEDICATION_ORDER, TABLE_MEDICATION_STATEMENT, TABLE_PRACTITIONER,
+    TABLE_CONCEPT, TABLE_CONCEPT_MAP, TABLE_APPOINTMENT, TABLE_APPOINTMENT_PRACTITIONER,
+    MAX_OBSERVATIONS, DATE_RANGE_OPTIONS, CACHE_TTL_FAST, QUERY_TAG_PREFIX
+)
 from database import get_connection
 
 
-def get_observation_summary(person_id):
+def _to_pandas_batched(conn, query, query_tag=None):
     """
-    Get summary statistics for patient observations.
+    Run a query and build the result DataFrame batch by batch.
+
+    Batches are streamed straight into pd.concat, so each Arrow batch is
+    dropped once it has been converted; the pandas batches are still held
+    until concat builds the final frame.
 
     Args:
-        person_id: Patient identifier
+        conn: Snowflake session
+        query: SQL query string
+        query_tag: Optional QUERY_TAG suffix; tagged queries also request
+            Snowflake's persisted result cache
 
     Returns:
-        Dictionary with summary stats
+        DataFrame with query results (empty if no rows)
     """
-    conn = get_connection()
+    statement_params = None
+    if query_tag:
+        statement_params = {
+            "QUERY_TAG": f"{QUERY_TAG_PREFIX}:{query_tag}",
+            "USE_CACHED_RESULT": "true"
+        }
+    batches = conn.sql(query).to_pandas_batches(statement_params=statement_params)
 
-    query = f"""
+    # pd.concat raises on an empty iterable, so check for a first batch
+    first_batch = next(batches, None)
+    if first_batch is None:
+        return pd.DataFrame()
+    return pd.concat(chain([first_batch], batches), ignore_index=True)
+
+
+def _practitioner_display_sql(alias):
+    """
+    Build the SQL expression for a practitioner display name.
+    Matches utils.helpers.format_practitioner_name: LAST_NAME, First_Name (Title),
+    or 'N/A' when the last name is missing.
+
+    Args:
+        alias: Alias of the joined practitioner table
+
+    Returns:
+        SQL expression string
+    """
+    first_name = f"NULLIF(NULLIF({alias}.first_name, 'N/A'), '')"
+    return f"""CASE
+            WHEN NULLIF(NULLIF({alias}.last_name, 'N/A'), '') IS NULL THEN 'N/A'
+            ELSE UPPER({alias}.last_name)
+                || COALESCE(', ' || UPPER(LEFT({first_name}, 1)) || LOWER(SUBSTR({first_name}, 2)), '')
+                || COALESCE(' (' || NULLIF(NULLIF({alias}.title, 'N/A'), '') || ')', '')
+        END"""
+
+
+def _observation_summary_sql(person_id):
+    """
+    Build the observation summary query for a patient.
+
+    Args:
+        person_id: Patient identifier
+
+    Returns:
+        SQL query string
+    """
+    return f"""
     SELECT
         COUNT(*) as total_observations,
         MIN(clinical_effective_date) as earliest_date,
@@ -30,6 +86,77 @@ def get_observation_summary(person_id):
     WHERE person_id = '{person_id}'
     """
 
+
+def _medication_summary_sql(person_id):
+    """
+    Build the medication summary query for a patient.
+
+    Args:
+        person_id: Patient identifier
+
+    Returns:
+        SQL query string
+    """
+    return f"""
+    SELECT
+        COUNT(*) as total_medications,
+        MIN(m.clinical_effective_date) as earliest_date,
+        MAX(m.clinical_effective_date) as most_recent_date,
+        COUNT(CASE
+            WHEN ms.cancellation_date IS NOT NULL AND ms.cancellation_date <= CURRENT_DATE() THEN NULL
+            WHEN ms.expiry_date IS NOT NULL AND ms.expiry_date < CURRENT_DATE() THEN NULL
+            WHEN ms.is_active = FALSE THEN NULL
+            WHEN m.duration_days IS NOT NULL
+                AND DATEADD(day, m.duration_days, m.clinical_effective_date) > CURRENT_DATE()
+            THEN 1
+        END) as current_medications
+    FROM {TABLE_MEDICATION_ORDER} m
+    LEFT JOIN {TABLE_MEDICATION_STATEMENT} ms
+        ON m.medication_statement_id = ms.id
+    WHERE m.person_id = '{person_id}'
+    """
+
+
+def _appointment_summary_sql(person_id):
+    """
+    Build the appointment summary query for a patient.
+
+    Args:
+        person_id: Patient identifier
+
+    Returns:
+        SQL query string
+    """
+    return f"""
+    SELECT
+        COUNT(*) as total_appointments,
+        MIN(start_date) as earliest_date,
+        MAX(CASE WHEN start_date < CURRENT_TIMESTAMP() THEN start_date END) as most_recent_date,
+        COUNT(CASE
+            WHEN start_date >= DATEADD(month, -12, CURRENT_DATE())
+            THEN 1
+        END) as appointments_last_12m
+    FROM {TABLE_APPOINTMENT}
+    WHERE person_id = '{person_id}'
+    """
+
+
+@st.cache_data(ttl=CACHE_TTL_FAST, show_spinner=False)
+def get_observation_summary(person_id):
+    """
+    Get summary statistics for patient observations.
+    Results are cached per person_id.
+
+    Args:
+        person_id: Patient identifier
+
+    Returns:
+        Dictionary with summary stats
+    """
+    conn = get_connection()
+
+    query = _observation_summary_sql(person_id)
+
     try:
         result = conn.sql(query).to_pandas()
         if result.empty:
@@ -54,18 +181,22 @@ def get_observation_summary(person_id):
         }
 
 
-def get_patient_observations(person_id, date_from=None, date_to=None, search_term=""):
+@st.cache_data(ttl=CACHE_TTL_FAST, show_spinner=False)
+def get_patient_observations(person_id, date_from=None, date_to=None, search_term="", limit=MAX_OBSERVATIONS, offset=0):
     """
     Get observations for a patient with optional filters.
+    Results are cached per combination of arguments.
 
     Args:
         person_id: Patient identifier
         date_from: Start date filter (optional)
         date_to: End date filter (optional)
         search_term: Search term for code or description (optional)
+        limit: Maximum number of rows to return (default MAX_OBSERVATIONS)
+        offset: Number of most recent rows to skip, for paging (default 0)
 
     Returns:
-        DataFrame with observations
+        DataFrame with observations, including TOTAL_ROWS (matching rows before paging)
     """
     conn = get_connection()
 
@@ -97,10 +228,9 @@ def get_patient_observations(person_id, date_from=None, date_to=None, search_ter
         o.result_unit_display,
         o.is_problem,
         COALESCE(episodicity_concept.display, o.episodicity_concept_id) as episodicity_display,
-        p.last_name as practitioner_last_name,
-        p.first_name as practitioner_first_name,
-        p.title as practitioner_title,
-        o.id
+        {_practitioner_display_sql('p')} as practitioner_display,
+        o.id,
+        COUNT(*) OVER () as total_rows
     FROM {TABLE_OBSERVATION} o
     LEFT JOIN {TABLE_PRACTITIONER} p
         ON o.practitioner_id = p.id
@@ -110,21 +240,35 @@ def get_patient_observations(person_id, date_from=None, date_to=None, search_ter
     LEFT JOIN {TABLE_CONCEPT} episodicity_concept
         ON episodicity_map.target_code_id = episodicity_concept.id
     WHERE {where_sql}
-    ORDER BY o.clinical_effective_date DESC
-    LIMIT {MAX_OBSERVATIONS}
+    ORDER BY o.clinical_effective_date DESC, o.id
+    LIMIT {int(limit)} OFFSET {int(offset)}
     """
 
     try:
-        result = conn.sql(query).to_pandas()
-        return result
+        # Rows are already capped by LIMIT; fetch them in Arrow batches
+        result = _to_pandas_batched(conn, query, query_tag="observations")
+        if result.empty:
+            return result
+
+        # Codes, units, episodicity and practitioners repeat across a
+        # patient's observations, so store them as categoricals
+        return result.astype({
+            'MAPPED_CONCEPT_CODE': 'category',
+            'MAPPED_CONCEPT_DISPLAY': 'category',
+            'RESULT_UNIT_DISPLAY': 'category',
+            'EPISODICITY_DISPLAY': 'category',
+            'PRACTITIONER_DISPLAY': 'category'
+        })
     except Exception as e:
         st.error(f"Error loading observations: {str(e)}")
         return pd.DataFrame()
 
 
+@st.cache_data(ttl=CACHE_TTL_FAST, show_spinner=False)
 def get_medication_summary(person_id):
     """
     Get summary statistics for patient medications.
+    Results are cached per person_id.
 
     Args:
         person_id: Patient identifier
@@ -134,24 +278,7 @@ def get_medication_summary(person_id):
     """
     conn = get_connection()
 
-    query = f"""
-    SELECT
-        COUNT(*) as total_medications,
-        MIN(m.clinical_effective_date) as earliest_date,
-        MAX(m.clinical_effective_date) as most_recent_date,
-        COUNT(CASE
-            WHEN ms.cancellation_date IS NOT NULL AND ms.cancellation_date <= CURRENT_DATE() THEN NULL
-            WHEN ms.expiry_date IS NOT NULL AND ms.expiry_date < CURRENT_DATE() THEN NULL
-            WHEN ms.is_active = FALSE THEN NULL
-            WHEN m.duration_days IS NOT NULL
-                AND DATEADD(day, m.duration_days, m.clinical_effective_date) > CURRENT_DATE()
-            THEN 1
-        END) as current_medications
-    FROM {TABLE_MEDICATION_ORDER} m
-    LEFT JOIN {TABLE_MEDICATION_STATEMENT} ms
-        ON m.medication_statement_id = ms.id
-    WHERE m.person_id = '{person_id}'
-    """
+    query = _medication_summary_sql(person_id)
 
     try:
         result = conn.sql(query).to_pandas()
@@ -180,31 +307,29 @@ def get_medication_summary(person_id):
         }
 
 
-def get_patient_medications(person_id, date_from=None, date_to=None, search_term="", current_only=False):
+@st.cache_data(ttl=CACHE_TTL_FAST, show_spinner=False)
+def get_patient_medications(person_id, date_from=None, date_to=None, search_term="", include_current=False):
     """
     Get medications for a patient with optional filters.
+    Each row carries a STATUS ("Current", "Cancelled", "Expired" or "Past")
+    computed in the query. Results are cached per combination of arguments.
 
     Args:
         person_id: Patient identifier
         date_from: Start date filter (optional)
         date_to: End date filter (optional)
         search_term: Search term for code or description (optional)
-        current_only: If True, only return current/active medications (default False)
+        include_current: Include all current medications regardless of date
+            filters, so current and past can be split from one query (default False)
 
     Returns:
         DataFrame with medications
     """
     conn = get_connection()
 
-    # Build WHERE clause
+    # Build WHERE clause (person and search apply to every row)
     where_clauses = [f"m.person_id = '{person_id}'"]
 
-    if date_from:
-        where_clauses.append(f"m.clinical_effective_date >= '{date_from}'")
-
-    if date_to:
-        where_clauses.append(f"m.clinical_effective_date <= '{date_to}'")
-
     if search_term and search_term.strip():
         search_pattern = f"%{search_term}%"
         where_clauses.append(
@@ -212,48 +337,74 @@ def get_patient_medications(person_id, date_from=None, date_to=None, search_term
             f"OR m.mapped_concept_display ILIKE '{search_pattern}')"
         )
 
-    # Filter for current medications only
-    if current_only:
-        where_clauses.append("""
-            (ms.cancellation_date IS NULL OR ms.cancellation_date > CURRENT_DATE())
-            AND (ms.expiry_date IS NULL OR ms.expiry_date >= CURRENT_DATE())
-            AND (ms.is_active IS NULL OR ms.is_active = TRUE)
-            AND (
-                m.duration_days IS NULL 
-                OR DATEADD(day, m.duration_days, m.clinical_effective_date) >= CURRENT_DATE()
-            )
-        """)
-
     where_sql = " AND ".join(where_clauses)
 
+    # Date filters and the row cap apply to past medications only when
+    # current medications are included
+    date_clauses = []
+    if date_from:
+        date_clauses.append(f"clinical_effective_date >= '{date_from}'")
+    if date_to:
+        date_clauses.append(f"clinical_effective_date <= '{date_to}'")
+    if include_current:
+        date_clauses.append("status <> 'Current'")
+
+    date_sql = " AND ".join(date_clauses) if date_clauses else "TRUE"
+
+    # Status rules are checked in order; the first match wins
     query = f"""
-    SELECT
-        m.clinical_effective_date,
-        m.mapped_concept_code,
-        m.mapped_concept_display,
-        m.dose,
-        m.quantity_value,
-        m.quantity_unit,
-        m.duration_days,
-        m.estimated_cost,
-        m.issue_method_description,
-        ms.bnf_reference,
-        ms.authorisation_type_display,
-        ms.is_active as statement_is_active,
-        ms.cancellation_date,
-        ms.expiry_date,
-        p.last_name as practitioner_last_name,
-        p.first_name as practitioner_first_name,
-        p.title as practitioner_title,
-        m.id
-    FROM {TABLE_MEDICATION_ORDER} m
-    LEFT JOIN {TABLE_MEDICATION_STATEMENT} ms
-        ON m.medication_statement_id = ms.id
-    LEFT JOIN {TABLE_PRACTITIONER} p
-        ON m.practitioner_id = p.id
-    WHERE {where_sql}
-    ORDER BY m.clinical_effective_date DESC
-    LIMIT {MAX_OBSERVATIONS}
+    WITH meds AS (
+        SELECT
+            m.clinical_effective_date,
+            m.mapped_concept_code,
+            m.mapped_concept_display,
+            m.dose,
+            CASE
+                WHEN m.quantity_value IS NULL THEN 'N/A'
+                WHEN NULLIF(m.quantity_unit, '') IS NULL THEN m.quantity_value::VARCHAR
+                ELSE m.quantity_value || ' ' || m.quantity_unit
+            END as quantity_info,
+            CASE
+                WHEN NULLIF(m.duration_days, 0) IS NULL THEN ''
+                ELSE TRUNC(m.duration_days) || ' days'
+            END as duration_info,
+            m.estimated_cost,
+            m.issue_method_description,
+            ms.bnf_reference,
+            ms.authorisation_type_display,
+            {_practitioner_display_sql('p')} as practitioner_display,
+            CASE
+                WHEN ms.cancellation_date <= CURRENT_DATE() THEN 'Cancelled'
+                WHEN ms.expiry_date < CURRENT_DATE() THEN 'Expired'
+                WHEN ms.is_active = FALSE THEN 'Past'
+                WHEN DATEADD(day, m.duration_days, m.clinical_effective_date) < CURRENT_DATE() THEN 'Expired'
+                ELSE 'Current'
+            END as status,
+            m.id
+        FROM {TABLE_MEDICATION_ORDER} m
+        LEFT JOIN {TABLE_MEDICATION_STATEMENT} ms
+            ON m.medication_statement_id = ms.id
+        LEFT JOIN {TABLE_PRACTITIONER} p
+            ON m.practitioner_id = p.id
+        WHERE {where_sql}
+    )
+    SELECT * FROM (
+        SELECT * FROM meds
+        WHERE {date_sql}
+        ORDER BY clinical_effective_date DESC
+        LIMIT {MAX_OBSERVATIONS}
+    )
+    """
+
+    if include_current:
+        query += """
+    UNION ALL
+    SELECT * FROM meds
+    WHERE status = 'Current'
+    """
+
+    query += """
+    ORDER BY clinical_effective_date DESC
     """
 
     try:
@@ -264,19 +415,18 @@ def get_patient_medications(person_id, date_from=None, date_to=None, search_term
         return pd.DataFrame()
 
 
-def calculate_date_range(range_option):
+def calculate_date_range(range_option, options=DATE_RANGE_OPTIONS):
     """
     Calculate date range based on selection.
 
     Args:
         range_option: Selected date range option
+        options: Mapping of range option to number of days (default DATE_RANGE_OPTIONS)
 
     Returns:
         Tuple of (date_from, date_to) or (None, None) for all time
     """
-    from config import DATE_RANGE_OPTIONS
-
-    days = DATE_RANGE_OPTIONS.get(range_option)
+    days = options.get(range_option)
 
     if days is None:
         return None, None
@@ -287,9 +437,11 @@ def calculate_date_range(range_option):
     return date_from, date_to
 
 
+@st.cache_data(ttl=CACHE_TTL_FAST, show_spinner=False)
 def get_appointment_summary(person_id):
     """
     Get summary statistics for patient appointments.
+    Results are cached per person_id.
 
     Args:
         person_id: Patient identifier
@@ -297,21 +449,9 @@ def get_appointment_summary(person_id):
     Returns:
         Dictionary with summary stats
     """
-    from config import TABLE_APPOINTMENT
     conn = get_connection()
 
-    query = f"""
-    SELECT
-        COUNT(*) as total_appointments,
-        MIN(start_date) as earliest_date,
-        MAX(CASE WHEN start_date < CURRENT_TIMESTAMP() THEN start_date END) as most_recent_date,
-        COUNT(CASE
-            WHEN start_date >= DATEADD(month, -12, CURRENT_DATE())
-            THEN 1
-        END) as appointments_last_12m
-    FROM {TABLE_APPOINTMENT}
-    WHERE person_id = '{person_id}'
-    """
+    query = _appointment_summary_sql(person_id)
 
     try:
         result = conn.sql(query).to_pandas()
@@ -339,53 +479,110 @@ def get_appointment_summary(person_id):
         }
 
 
+@st.cache_data(ttl=CACHE_TTL_FAST, show_spinner=False)
+def get_patient_summary_metrics(person_id):
+    """
+    Get observation, medication and appointment summary metrics in one query,
+    including the most recent date across all three record types.
+    Results are cached per person_id.
+
+    Args:
+        person_id: Patient identifier
+
+    Returns:
+        Dictionary with summary metrics
+    """
+    conn = get_connection()
+
+    query = f"""
+    WITH obs AS ({_observation_summary_sql(person_id)}),
+    meds AS ({_medication_summary_sql(person_id)}),
+    appts AS ({_appointment_summary_sql(person_id)})
+    SELECT
+        obs.total_observations,
+        meds.total_medications,
+        meds.current_medications,
+        appts.total_appointments,
+        appts.appointments_last_12m,
+        GREATEST_IGNORE_NULLS(
+            obs.most_recent_date,
+            meds.most_recent_date,
+            appts.most_recent_date::DATE
+        ) as most_recent_date
+    FROM obs
+    CROSS JOIN meds
+    CROSS JOIN appts
+    """
+
+    empty_metrics = {
+        "total_observations": 0,
+        "total_medications": 0,
+        "current_medications": 0,
+        "total_appointments": 0,
+        "appointments_last_12m": 0,
+        "most_recent_date": None
+    }
+
+    try:
+        result = conn.sql(query).to_pandas()
+        if result.empty:
+            return empty_metrics
+
+        row = result.iloc[0]
+        return {
+            "total_observations": int(row["TOTAL_OBSERVATIONS"]),
+            "total_medications": int(row["TOTAL_MEDICATIONS"]),
+            "current_medications": int(row["CURRENT_MEDICATIONS"]),
+            "total_appointments": int(row["TOTAL_APPOINTMENTS"]),
+            "appointments_last_12m": int(row["APPOINTMENTS_LAST_12M"]),
+            "most_recent_date": row["MOST_RECENT_DATE"]
+        }
+    except Exception as e:
+        st.error(f"Error loading record summary: {str(e)}")
+        return empty_metrics
+
+
+@st.cache_data(ttl=CACHE_TTL_FAST, show_spinner=False)
 def get_patient_appointments(person_id, date_from=None, date_to=None, include_future=True):
     """
     Get appointments for a patient with optional filters.
+    Results are cached per (person_id, date_from, date_to, include_future);
+    callers receive a fresh copy of the cached DataFrame on each call.
 
     Args:
         person_id: Patient identifier
         date_from: Start date filter (optional)
         date_to: End date filter (optional)
-        include_future: Include future appointments regardless of date_from (default True)
+        include_future: Include future appointments regardless of date filters (default True)
 
     Returns:
         DataFrame with appointments
     """
-    from config import TABLE_APPOINTMENT, TABLE_APPOINTMENT_PRACTITIONER, TABLE_PRACTITIONER, TABLE_CONCEPT, TABLE_CONCEPT_MAP, MAX_OBSERVATIONS
     conn = get_connection()
 
-    # Build WHERE clause - always include future appointments if requested
-    if include_future and date_from:
-        where_clauses = [
-            f"a.person_id = '{person_id}'",
-            f"(a.start_date >= '{date_from}' OR a.start_date >= CURRENT_TIMESTAMP())"
-        ]
-    else:
-        where_clauses = [f"a.person_id = '{person_id}'"]
-        if date_from:
-            where_clauses.append(f"a.start_date >= '{date_from}'")
-
+    # Date filters and the row cap apply to past appointments only; future
+    # appointments are returned in full via a second UNION ALL branch.
+    # The branches are split on CURRENT_DATE(), which keeps the query eligible
+    # for Snowflake's persisted query result cache, so today's appointments
+    # all arrive with the future rows; callers split them on the clock.
+    where_clauses = [f"a.person_id = '{person_id}'"]
+    if date_from:
+        where_clauses.append(f"a.start_date >= '{date_from}'")
     if date_to:
         where_clauses.append(f"a.start_date <= '{date_to}'")
+    if include_future:
+        where_clauses.append("a.start_date < CURRENT_DATE()")
 
     where_sql = " AND ".join(where_clauses)
 
-    query = f"""
+    select_sql = f"""
     SELECT
         a.start_date,
-        a.type,
-        COALESCE(status_concept.display, a.appointment_status_concept_id) as appointment_status,
-        a.national_slot_category_name,
+        COALESCE(INITCAP(COALESCE(status_concept.display, a.appointment_status_concept_id)), 'Unknown') as status_display,
+        COALESCE(NULLIF(NULLIF(a.national_slot_category_name, 'N/A'), ''), 'Not Specified') as slot_category,
         COALESCE(contact_concept.display, a.contact_mode_concept_id) as contact_mode,
         a.planned_duration,
-        a.actual_duration,
-        a.patient_wait,
-        p.last_name as practitioner_last_name,
-        p.first_name as practitioner_first_name,
-        p.title as practitioner_title,
-        CASE WHEN a.start_date >= CURRENT_TIMESTAMP() THEN TRUE ELSE FALSE END as is_future,
-        a.id
+        {_practitioner_display_sql('p')} as practitioner_display
     FROM {TABLE_APPOINTMENT} a
     LEFT JOIN {TABLE_APPOINTMENT_PRACTITIONER} ap
         ON a.id = ap.appointment_id
@@ -401,22 +598,102 @@ def get_patient_appointments(person_id, date_from=None, date_to=None, include_fu
         AND contact_map.is_primary = TRUE
     LEFT JOIN {TABLE_CONCEPT} contact_concept
         ON contact_map.target_code_id = contact_concept.id
-    WHERE {where_sql}
-    ORDER BY a.start_date DESC
-    LIMIT {MAX_OBSERVATIONS}
+    """
+
+    query = f"""
+    SELECT * FROM (
+        {select_sql}
+        WHERE {where_sql}
+        ORDER BY a.start_date DESC
+        LIMIT {MAX_OBSERVATIONS}
+    )
+    """
+
+    if include_future:
+        query += f"""
+    UNION ALL
+    {select_sql}
+    WHERE a.person_id = '{person_id}'
+        AND a.start_date >= CURRENT_DATE()
+    """
+
+    query += """
+    ORDER BY start_date DESC
     """
 
     try:
-        result = conn.sql(query).to_pandas()
+        result = _to_pandas_batched(conn, query, query_tag="appointments")
+        if not result.empty:
+            # TIMESTAMP columns normally arrive as datetime64 already
+            if not pd.api.types.is_datetime64_any_dtype(result["START_DATE"]):
+                result["START_DATE"] = pd.to_datetime(result["START_DATE"], errors="coerce")
         return result
     except Exception as e:
         st.error(f"Error loading appointments: {str(e)}")
         return pd.DataFrame()
 
 
+@st.cache_data(ttl=CACHE_TTL_FAST, show_spinner=False)
+def get_appointment_monthly_counts(person_id, date_from=None, date_to=None):
+    """
+    Get appointment counts per month, status and slot category for days
+    before today (today's appointments are counted by the caller from the
+    detail rows). Aggregated in Snowflake so charts only receive one row
+    per group.
+
+    Args:
+        person_id: Patient identifier
+        date_from: Start date filter (optional)
+        date_to: End date filter (optional)
+
+    Returns:
+        DataFrame with YEAR_MONTH, STATUS_DISPLAY, SLOT_CATEGORY and COUNT
+    """
+    conn = get_connection()
+
+    where_clauses = [
+        f"a.person_id = '{person_id}'",
+        "a.start_date < CURRENT_DATE()"
+    ]
+    if date_from:
+        where_clauses.append(f"a.start_date >= '{date_from}'")
+    if date_to:
+        where_clauses.append(f"a.start_date <= '{date_to}'")
+
+    where_sql = " AND ".join(where_clauses)
+
+    query = f"""
+    SELECT
+        DATE_TRUNC('month', a.start_date) as year_month,
+        COALESCE(INITCAP(COALESCE(status_concept.display, a.appointment_status_concept_id)), 'Unknown') as status_display,
+        COALESCE(NULLIF(NULLIF(a.national_slot_category_name, 'N/A'), ''), 'Not Specified') as slot_category,
+        COUNT(*) as count
+    FROM {TABLE_APPOINTMENT} a
+    LEFT JOIN {TABLE_CONCEPT_MAP} status_map
+        ON a.appointment_status_concept_id = status_map.source_code_id
+        AND status_map.is_primary = TRUE
+    LEFT JOIN {TABLE_CONCEPT} status_concept
+        ON status_map.target_code_id = status_concept.id
+    WHERE {where_sql}
+    GROUP BY 1, 2, 3
+    ORDER BY 1
+    """
+
+    try:
+        result = _to_pandas_batched(conn, query, query_tag="appointment_counts")
+        if not result.empty:
+            result["YEAR_MONTH"] = pd.to_datetime(result["YEAR_MONTH"])
+        return result
+    except Exception as e:
+        st.error(f"Error loading appointment counts: {str(e)}")
+        return pd.DataFrame()
+
+
+@st.cache_data(ttl=CACHE_TTL_FAST, show_spinner=False)
 def get_patient_problems(person_id):
     """
     Get active and past problems for a patient from observations table.
+    Results are cached per person_id.
 
     Args:
         person_id: Patient identifier
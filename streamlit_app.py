@@ -28,6 +28,12 @@ def main():
     if 'selected_patient' not in st.session_state:
         st.session_state.selected_patient = None
 
+    if 'selected_person_id' not in st.session_state:
+        st.session_state.selected_person_id = None
+
+    if 'selected_person_id_sk' not in st.session_state:
+        st.session_state.selected_person_id_sk = None
+
     # Page routing
     if st.session_state.page == 'search':
         from page_modules.search import render_search
@@ -3,6 +3,8 @@ Helper functions for formatting and display
 """
 
 from datetime import datetime
+from functools import lru_cache
+import pandas as pd
 import streamlit as st
 
 
@@ -29,6 +31,19 @@ def format_date(date_value):
         return str(date_value)
 
 
+def format_dates(date_values):
+    """
+    Vectorized format_date for a whole column.
+
+    Args:
+        date_values: Series of date values (datetime, date, or string)
+
+    Returns:
+        Series of formatted date strings ('N/A' where missing or unparseable)
+    """
+    return pd.to_datetime(date_values, errors="coerce").dt.strftime("%d %b %Y").fillna("N/A")
+
+
 def format_boolean(value):
     """
     Format boolean value with emoji.
@@ -62,6 +77,21 @@ def render_status_badge(is_active, is_deceased, inactive_reason=None):
         st.markdown(f'<span class="status-inactive">INACTIVE{reason}</span>', unsafe_allow_html=True)
 
 
+def render_html_grid(rows):
+    """
+    Render pre-built HTML cells as CSS grid rows in a single markdown element.
+
+    Args:
+        rows: List of rows, each a list of HTML strings (one per column;
+            None leaves the cell empty)
+    """
+    html = "".join(
+        f'<div class="info-grid" style="grid-template-columns: repeat({len(row)}, 1fr);">'
+        + "".join(f"<div>{cell or ''}</div>" for cell in row)
+        + "</div>"
+        for row in rows
+    )
+    st.markdown(html, unsafe_allow_html=True)
 
 
 def get_status_badge_html(is_active, is_deceased, inactive_reason=None):
@@ -105,6 +135,24 @@ def format_value_with_unit(value, unit):
     return str(value)
 
 
+def format_values_with_units(values, units):
+    """
+    Vectorized format_value_with_unit for whole columns.
+
+    Args:
+        values: Series of observation values
+        units: Series of units of measurement
+
+    Returns:
+        Series of formatted strings ('N/A' where value is missing)
+    """
+    value = values.astype("string")
+    unit = units.astype("string").fillna("")
+
+    formatted = value.where(unit.eq(""), value + " " + unit)
+    return formatted.where(value.fillna("").ne(""), "N/A")
+
+
 def safe_str(value):
     """
     Safely convert value to string.
@@ -120,9 +168,11 @@ def safe_str(value):
     return str(value)
 
 
+@lru_cache(maxsize=1024)
 def format_practitioner_name(last_name, first_name, title):
     """
     Format practitioner name as: LAST_NAME, First_Name (Title)
+    Memoized, as the same few practitioners repeat across a patient's records.
 
     Args:
         last_name: Practitioner last name
@@ -151,6 +201,7 @@ def format_practitioner_name(last_name, first_name, title):
 
     return name
 
+
 def format_month_year(date_value):
     """
     Format date as month and year only (e.g., "Aug 1967").